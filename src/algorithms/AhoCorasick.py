@@ -1,6 +1,9 @@
-from collections import defaultdict
+from array import array
+from collections import defaultdict, deque
+from functools import lru_cache
 
-ALPHABET_SIZE : int = 128 # ascii chars
+ALPHABET_SIZE : int = 128 # ascii chars, only used by the "trie" engine
+COMPILED_CACHE_SIZE : int = 32 # number of compiled keyword sets kept between queries
 class AhoCorasick:
     def __init__(self, patterns: list[str]):
         self.patterns: list[str] = patterns
@@ -29,8 +32,12 @@ class AhoCorasick:
         Builds the initial Trie from the list of patterns and sets the initial output values.
         """
         root : int = self.add_state() # add state 0
+        seen : set[str] = set()
         
         for i, pattern in enumerate(self.patterns):
+            if pattern in seen:
+                continue # a repeated pattern gets one output bit, so it is counted once
+            seen.add(pattern)
             current_state : int = root
             for char in pattern:
                 char_code : int = ord(char)
@@ -72,14 +79,13 @@ class AhoCorasick:
                     # Consolidate outputs from the failure state
                     self.out[next_state] |= self.out[self.fail[next_state]]
 
-    @staticmethod
-    def search_multi_pattern(text: str, patterns: list[str]) -> dict[str, int]:
-        if not text or not patterns:
-            return {p: 0 for p in patterns}
-
-        ac = AhoCorasick(patterns)
-
+    def count_occurrences(self, text: str) -> dict[str, int]:
+        """
+        Counts every pattern of the automaton in text with a single scan.
+        """
         results: dict[str, int] = defaultdict(int)
+        if not text:
+            return {p: 0 for p in self.patterns}
 
         current_state: int = 0
         for i, char in enumerate(text):
@@ -88,17 +94,179 @@ class AhoCorasick:
                 current_state = 0
                 continue
 
-            while ac.trie[current_state][char_code] == -1:
-                current_state = ac.fail[current_state]
+            while self.trie[current_state][char_code] == -1:
+                current_state = self.fail[current_state]
             
-            current_state = ac.trie[current_state][char_code]
+            current_state = self.trie[current_state][char_code]
 
-            if ac.out[current_state] > 0:
-                for j in range(len(ac.patterns)):
-                    if (ac.out[current_state] & (1 << j)):
-                        word: str = ac.patterns[j]
+            if self.out[current_state] > 0:
+                for j in range(len(self.patterns)):
+                    if (self.out[current_state] & (1 << j)):
+                        word: str = self.patterns[j]
                         results[word] += 1
         
-        final_results = {p: results[p] for p in patterns}
+        final_results = {p: results[p] for p in self.patterns}
         
-        return final_results
\ No newline at end of file
+        return final_results
+
+    @staticmethod
+    def compile(patterns: list[str], engine: str = "dfa"):
+        """
+        Returns the automaton for patterns, built once and reused for repeated queries.
+        engine is "trie" (this class) or "dfa" (CompactAhoCorasick).
+        """
+        return _compile(tuple(patterns), engine)
+
+    @staticmethod
+    def search_multi_pattern(text: str, patterns: list[str], engine: str = "dfa") -> dict[str, int]:
+        if not text or not patterns:
+            return {p: 0 for p in patterns}
+
+        return AhoCorasick.compile(patterns, engine).count_occurrences(text)
+
+class CompactAhoCorasick:
+    """
+    Aho-Corasick compiled into a full DFA stored in one flat array.
+
+    Every (state, char class) transition is precomputed, so scanning never
+    follows failure links. The alphabet is compressed: each char used by the
+    patterns gets a dense class id and every other code point shares class 0,
+    which always leads back to the root. Table entries hold
+    next_state * class_count so the scan only needs one lookup per character.
+    """
+    def __init__(self, patterns: list[str]):
+        self.patterns: list[str] = patterns
+
+        # char -> class id, chars not in any pattern are class 0 ("other")
+        self.classes: dict[str, int] = {}
+        self.class_count: int = 1
+
+        # index: state, value: pattern indices that end in that state (failure outputs included)
+        self.output: list[tuple[int, ...]] = []
+
+        # flat transition table, row of class_count entries per state
+        self.table: array = array("i")
+
+        self.build()
+
+    def build(self) -> None:
+        for pattern in self.patterns:
+            for char in pattern:
+                if char not in self.classes:
+                    self.classes[char] = len(self.classes) + 1
+        self.class_count = width = len(self.classes) + 1
+
+        children: list[dict[int, int]] = [{}]
+        output: list[list[int]] = [[]]
+        seen : set[str] = set()
+        for i, pattern in enumerate(self.patterns):
+            if not pattern or pattern in seen:
+                continue # an empty pattern counts 0, like KMP, and a repeated one is counted once
+            seen.add(pattern)
+            state : int = 0
+            for char in pattern:
+                char_class : int = self.classes[char]
+                if char_class not in children[state]:
+                    children.append({})
+                    output.append([])
+                    children[state][char_class] = len(children) - 1
+                state = children[state][char_class]
+            output[state].append(i)
+
+        state_count : int = len(children)
+        table = array("i", bytes(4 * state_count * width))
+        fail : list[int] = [0] * state_count
+
+        queue : deque[int] = deque()
+        for char_class, state in children[0].items():
+            table[char_class] = state * width
+            queue.append(state)
+
+        while queue:
+            state : int = queue.popleft()
+            row : int = state * width
+            fail_row : int = fail[state] * width
+            # missing transitions behave like the failure state's transitions
+            table[row:row + width] = table[fail_row:fail_row + width]
+            output[state].extend(output[fail[state]])
+            for char_class, next_state in children[state].items():
+                fail[next_state] = table[fail_row + char_class] // width
+                table[row + char_class] = next_state * width
+                queue.append(next_state)
+
+        self.table = table
+        self.output = [tuple(indices) for indices in output]
+
+    def count_occurrences(self, text: str) -> dict[str, int]:
+        results: dict[str, int] = {p: 0 for p in self.patterns}
+        if not text:
+            return results
+
+        table = self.table
+        char_class = self.classes.get
+        width : int = self.class_count
+        visits : list[int] = [0] * len(self.output)
+        row : int = 0
+        for char in text:
+            row = table[row + char_class(char, 0)]
+            visits[row // width] += 1
+
+        # every visit of a state is one occurrence of each pattern ending there
+        for state, count in enumerate(visits):
+            if count:
+                for j in self.output[state]:
+                    results[self.patterns[j]] += count
+        return results
+
+ENGINES = {"trie": AhoCorasick, "dfa": CompactAhoCorasick}
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(patterns: tuple[str, ...], engine: str = "dfa"):
+    return ENGINES[engine](list(patterns))
+
+import unittest
+from algorithms.oracle import UNICODE_TEXT, UNICODE_COUNTS, brute_force_counts, random_cases
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_multi_pattern_count(self):
+        """Test overlapping and nested patterns on both engines."""
+        text = "she sells sea shells"
+        patterns = ["he", "she", "sea", "x"]
+        expected = {"he": 2, "she": 2, "sea": 1, "x": 0}
+        for engine in ENGINES:
+            self.assertEqual(AhoCorasick.search_multi_pattern(text, patterns, engine), expected)
+
+    def test_dfa_matches_trie(self):
+        """Test that the compact DFA gives the same counts as the trie engine."""
+        patterns = ["aa", "ab", "bab", "a", "abba"]
+        text = "abbabaabbaaab" * 20
+        self.assertEqual(
+            AhoCorasick.search_multi_pattern(text, patterns, "dfa"),
+            AhoCorasick.search_multi_pattern(text, patterns, "trie")
+        )
+
+    def test_compile_is_cached(self):
+        """Test that the same keyword set reuses one automaton."""
+        self.assertIs(AhoCorasick.compile(["cv", "hr"], "dfa"), AhoCorasick.compile(["cv", "hr"], "dfa"))
+
+    def test_unicode_text(self):
+        """Test that non-ascii chars in text and patterns still match."""
+        self.assertEqual(AhoCorasick.search_multi_pattern(UNICODE_TEXT, list(UNICODE_COUNTS)), UNICODE_COUNTS)
+
+    def test_matches_brute_force(self):
+        """Test the dfa engine against a brute-force search, with nested keywords sharing failure links."""
+        for text, patterns in random_cases(1, 300, 80, 6, 12):
+            self.assertEqual(AhoCorasick.search_multi_pattern(text, patterns, "dfa"), brute_force_counts(text, patterns), (text, patterns))
+
+    def test_repeated_keywords(self):
+        """Test that a keyword given twice is counted once, like KMP."""
+        for engine in ENGINES:
+            self.assertEqual(AhoCorasick.search_multi_pattern("aaa", ["aa", "a", "aa"], engine), {"aa": 2, "a": 3}, engine)
+
+    def test_empty_inputs(self):
+        """Test with empty text."""
+        for engine in ENGINES:
+            self.assertEqual(AhoCorasick.search_multi_pattern("", ["a"], engine), {"a": 0})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+from algorithms.Levenshtein import Levenshtein
+
+class BKTree:
+    """
+    Burkhard-Keller tree over a vocabulary, keyed by Levenshtein distance.
+
+    By the triangle inequality a query with radius r only needs to descend
+    into children whose edge distance d satisfies |d - dist(query, node)| <= r.
+    """
+    def __init__(self):
+        # node: [term, {edge distance: child node}]
+        self.root: list = None
+        self.size: int = 0
+
+    def add(self, term: str) -> None:
+        if self.root is None:
+            self.root = [term, {}]
+            self.size = 1
+            return
+
+        peq : dict[str, int] = Levenshtein.myers_pattern(term)
+        node : list = self.root
+        while True:
+            distance : int = Levenshtein.myers_distance(peq, len(term), node[0])
+            if distance == 0:
+                return # already in the tree
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [term, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, query: str, radius: int) -> list[tuple[str, int]]:
+        """
+        Returns every (term, distance) with distance <= radius from query.
+        """
+        result : list[tuple[str, int]] = []
+        if self.root is None:
+            return result
+
+        peq : dict[str, int] = Levenshtein.myers_pattern(query)
+        stack : list[list] = [self.root]
+        while stack:
+            term, children = stack.pop()
+            distance : int = Levenshtein.myers_distance(peq, len(query), term)
+            if distance <= radius:
+                result.append((term, distance))
+            for edge, child in children.items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return result
+
+    def clear(self) -> None:
+        self.root = None
+        self.size = 0
+
+
+import random
+import unittest
+
+class TestBKTree(unittest.TestCase):
+    def test_search_matches_brute_force(self):
+        """Test radius queries against computing every distance with Levenshtein("dp")."""
+        rng = random.Random(0)
+        lv = Levenshtein("dp")
+        terms = list({"".join(rng.choice("abcé") for _ in range(rng.randint(1, 10))) for _ in range(400)})
+        tree = BKTree()
+        for term in terms + terms[:50]:  # duplicates are ignored
+            tree.add(term)
+        self.assertEqual(tree.size, len(terms))
+
+        for _ in range(100):
+            query = "".join(rng.choice("abcé") for _ in range(rng.randint(0, 10)))
+            radius = rng.randint(0, 4)
+            expected = sorted((term, d) for term in terms if (d := lv.calculate_distance(query, term)) <= radius)
+            self.assertEqual(sorted(tree.search(query, radius)), expected, (query, radius))
+
+    def test_empty_and_clear(self):
+        tree = BKTree()
+        self.assertEqual(tree.search("python", 2), [])
+        tree.add("python")
+        self.assertEqual(tree.search("pyhton", 2), [("python", 2)])
+        tree.clear()
+        self.assertEqual((tree.size, tree.search("python", 0)), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
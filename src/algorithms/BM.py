@@ -1,15 +1,40 @@
-# Boyer-Moore cuman pake 'Bad Character' heuristic karena Good Suffix gak di bahas di PPT 
+# Boyer-Moore lengkap (bad character + good suffix), plus varian Horspool dan Sunday.
+# Engine "badchar" adalah versi awal yang cuma pake bad character, disimpan buat pembanding.
+import unittest
 from collections import defaultdict
+from functools import lru_cache
+
+ENGINES : tuple[str, ...] = ("badchar", "full", "horspool", "sunday")
+DEFAULT_ENGINE : str = "full"
+ASCII_SIZE : int = 128 # dense shift tables cover ascii, other code points use FallbackTable
+COMPILED_CACHE_SIZE : int = 256 # number of (pattern, engine) tables kept between queries
+
+class FallbackTable(dict):
+    """
+    Char -> shift value, with default for every char not in the pattern.
+    Replaces the dense ascii list when the text has other code points.
+    """
+    def __init__(self, default: int):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key) -> int:
+        return self.default
+
 class BM:
     # string pattern
     # int occurences
-    def __init__(self, pattern: str):
+    def __init__(self, pattern: str, engine: str = DEFAULT_ENGINE):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown Boyer-Moore engine: {engine}")
+        self.engine = engine
         self.pattern = pattern
         self.occ_table = self.init_lot()     # holds Last Occurence Values for all characters in text
         self.occurences = 0
-    
+
     def set_pattern(self, pattern: str):
         self.pattern = pattern
+        self.occ_table = self.init_lot()
 
     def get_num_occurrences(self) -> int:
         return self.occurences
@@ -25,36 +50,135 @@ class BM:
                 occ_table[self.pattern[i]] = i
         return occ_table
 
+    @staticmethod
+    def good_suffix_table(pattern: str) -> list[int]:
+        """
+        Strong good-suffix shifts: after a mismatch at pattern[j] the window moves by
+        shift[j + 1], after a full match by shift[0] (the period of the pattern).
+        """
+        m : int = len(pattern)
+        shift : list[int] = [0] * (m + 1)
+        border : list[int] = [0] * (m + 1)  # border[i]: start of the widest border of pattern[i:]
+
+        i : int = m
+        j : int = m + 1
+        border[i] = j
+        while i > 0:
+            while j <= m and pattern[i - 1] != pattern[j - 1]:
+                if shift[j] == 0:
+                    shift[j] = j - i
+                j = border[j]
+            i -= 1
+            j -= 1
+            border[i] = j
+
+        # suffixes that only match as a prefix of the pattern
+        j = border[0]
+        for i in range(m + 1):
+            if shift[i] == 0:
+                shift[i] = j
+            if i == j:
+                j = border[j]
+        return shift
+
+    @staticmethod
+    def compile(pattern: str, engine: str = DEFAULT_ENGINE, ascii: bool = True) -> tuple:
+        """
+        Returns (pattern units, shift table, good-suffix table) for engine, built once
+        per pattern and reused. With ascii the units are bytes and the shift table is
+        a list indexed by byte value, otherwise the units are the str itself.
+        """
+        return _compile(pattern, engine, ascii)
+
     def search_positions(self, text: str) -> list[int]:
         pat_len: int = len(self.pattern)
         text_len: int = len(text)
 
         if pat_len == 0: return []
         if pat_len > text_len: return []
-        
+
+        if self.engine == "badchar":
+            return self.badchar_positions(text)
+
+        ascii : bool = text.isascii()
+        if ascii and not self.pattern.isascii():
+            return []
+        return self.scan(text.encode("ascii") if ascii else text, ascii)
+
+    def scan(self, text, ascii: bool) -> list[int]:
+        """
+        Runs the compiled engine over text, already as bytes when ascii.
+        """
+        units, table, good_suffix = self.compile(self.pattern, self.engine, ascii)
+        m : int = len(units)
+        last : int = len(text) - m
+        result : list[int] = []
+        s : int = 0
+
+        if self.engine == "full":
+            while s <= last:
+                j : int = m - 1
+                while j >= 0 and units[j] == text[s + j]:
+                    j -= 1
+                if j < 0:
+                    result.append(s)
+                    s += good_suffix[0]
+                else:
+                    bad_char : int = j - table[text[s + j]]
+                    s += good_suffix[j + 1] if good_suffix[j + 1] > bad_char else bad_char
+
+        elif self.engine == "horspool":
+            # the shift only depends on the last char of the window, so the
+            # window itself can be compared in one startswith call
+            final = units[m - 1]
+            while s <= last:
+                char = text[s + m - 1]
+                if char == final and text.startswith(units, s):
+                    result.append(s)
+                s += table[char]
+
+        else: # sunday
+            # the shift depends on the char right after the window
+            final = units[m - 1]
+            while s < last:
+                if text[s + m - 1] == final and text.startswith(units, s):
+                    result.append(s)
+                s += table[text[s + m]]
+            if s == last and text.startswith(units, s):
+                result.append(s)
+
+        return result
+
+    def badchar_positions(self, text: str) -> list[int]:
+        """
+        The original bad-character-only search, shifting by one after every match.
+        """
+        pat_len: int = len(self.pattern)
+        text_len: int = len(text)
+
         result: list[int] = []
         i_window_anchor: int = pat_len - 1
 
         while i_window_anchor < text_len:
-            temp_i: int = i_window_anchor 
+            temp_i: int = i_window_anchor
 
-            i: int = i_window_anchor 
-            j: int = pat_len - 1    
+            i: int = i_window_anchor
+            j: int = pat_len - 1
 
             while j >= 0 and text[i] == self.pattern[j]:
                 i -= 1
                 j -= 1
-            
-            if j < 0: 
+
+            if j < 0:
                 result.append(i + 1)
                 i_window_anchor = temp_i + 1
-            else: 
+            else:
                 mismatch: str = text[i]
                 lx = self.occ_table.get(mismatch, -1)
-                
+
                 shift = j - lx
                 i_window_anchor = temp_i + max(1, shift)
-                
+
         return result
 
     def count_occurrence(self, text: str) -> int:
@@ -63,12 +187,131 @@ class BM:
         return self.occurences
 
     @staticmethod
-    def search_multi_pattern(text: str, patterns: list[str]) -> dict[str, int]:
+    def search_multi_pattern(text: str, patterns: list[str], engine: str = DEFAULT_ENGINE) -> dict[str, int]:
         results: dict[str, int] = defaultdict(int)    # stores pattern, occurence
         if not text or not patterns: return {pattern: 0 for pattern in patterns}
 
+        # the text is converted once and shared by every pattern
+        ascii : bool = text.isascii()
+        units = text.encode("ascii") if ascii else text
+
         for pattern in patterns:
-            bm: object = BM(pattern)
-            num_occurrences = bm.count_occurrence(text)
+            bm: object = BM(pattern, engine)
+            if engine == "badchar" or not pattern or len(pattern) > len(text) or (ascii and not pattern.isascii()):
+                num_occurrences = bm.count_occurrence(text)
+            else:
+                num_occurrences = len(bm.scan(units, ascii))
             results[pattern] = num_occurrences if num_occurrences > 0 else 0
-        return results
\ No newline at end of file
+        return results
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(pattern: str, engine: str, ascii: bool) -> tuple:
+    m : int = len(pattern)
+    units = pattern.encode("ascii") if ascii else pattern
+
+    if engine == "full":
+        default, pairs = -1, ((units[i], i) for i in range(m))             # last occurrence
+    elif engine == "horspool":
+        default, pairs = m, ((units[i], m - 1 - i) for i in range(m - 1))  # distance to the last char
+    else:
+        default, pairs = m + 1, ((units[i], m - i) for i in range(m))      # distance past the window
+
+    table = [default] * ASCII_SIZE if ascii else FallbackTable(default)
+    for unit, value in pairs:
+        table[unit] = value # later positions overwrite earlier ones
+
+    good_suffix = BM.good_suffix_table(pattern) if engine == "full" else None
+    return units, table, good_suffix
+
+
+from algorithms.oracle import UNICODE_TEXT, UNICODE_COUNTS, brute_force_positions, random_cases
+
+class TestBM(unittest.TestCase):
+    @staticmethod
+    def strong_good_suffix(pattern: str, j: int) -> int:
+        """
+        Smallest shift that realigns pattern[j:] with itself and, for j > 0,
+        brings a different char under the mismatched pattern[j - 1].
+        """
+        m = len(pattern)
+        for shift in range(1, m + 1):
+            suffix_fits = all(k < shift or pattern[k - shift] == pattern[k] for k in range(j, m))
+            char_differs = j == 0 or j - 1 < shift or pattern[j - 1 - shift] != pattern[j - 1]
+            if suffix_fits and char_differs:
+                return shift
+        return m
+
+    def test_good_suffix_table(self):
+        """Test the shifts against a hand-checked pattern."""
+        self.assertEqual(BM.good_suffix_table("ANPANMAN"), [6, 6, 6, 6, 6, 6, 3, 8, 1])
+        self.assertEqual(BM.good_suffix_table("aaaa")[0], 1)
+        self.assertEqual(BM.good_suffix_table("abab")[0], 2)
+
+    def test_good_suffix_table_matches_definition(self):
+        """Test every pattern up to 8 chars over "ab" against the strong good-suffix rule."""
+        from itertools import product
+        for m in range(1, 9):
+            for chars in product("ab", repeat=m):
+                pattern = "".join(chars)
+                expected = [self.strong_good_suffix(pattern, j) for j in range(m + 1)]
+                self.assertEqual(BM.good_suffix_table(pattern), expected, pattern)
+
+    def test_good_suffix_beats_bad_char(self):
+        """Test a mismatch where only the good-suffix rule moves the window far."""
+        # in "bbab" the suffix "ab" matches, then the "b" under pattern[1] occurs
+        # last at pattern[3], so bad char gives a negative shift and good suffix gives 3
+        self.assertEqual(BM.good_suffix_table("baab")[2], 3)
+        self.assertEqual(BM("baab").search_positions("bbabbaabaab"), brute_force_positions("bbabbaabaab", "baab"))
+
+    def test_overlapping_matches(self):
+        """Test that every engine keeps overlapping occurrences."""
+        for engine in ENGINES:
+            bm = BM("aa", engine)
+            self.assertEqual(bm.count_occurrence("aaaa"), 3, engine)
+            self.assertEqual(bm.search_positions("aaaa"), [0, 1, 2], engine)
+            self.assertEqual(BM("ana", engine).search_positions("banana"), [1, 3], engine)
+
+    def test_engines_match_brute_force(self):
+        """Test every engine against a brute-force search on small alphabets."""
+        for text, (pattern,) in random_cases(0, 300, 60, 6):
+            expected = brute_force_positions(text, pattern)
+            for engine in ENGINES:
+                self.assertEqual(BM(pattern, engine).search_positions(text), expected, (engine, text, pattern))
+
+    def test_unicode(self):
+        """Test non-ascii text and patterns, and non-ascii patterns in ascii text."""
+        for engine in ENGINES:
+            self.assertEqual(BM.search_multi_pattern(UNICODE_TEXT, list(UNICODE_COUNTS), engine), UNICODE_COUNTS, engine)
+            self.assertEqual(BM("é", engine).count_occurrence("Jose Perez"), 0, engine)
+
+    def test_edge_cases(self):
+        """Test empty inputs and patterns longer than the text."""
+        for engine in ENGINES:
+            self.assertEqual(BM("", engine).count_occurrence("abc"), 0)
+            self.assertEqual(BM("abc", engine).count_occurrence(""), 0)
+            self.assertEqual(BM("abcd", engine).count_occurrence("abc"), 0)
+            self.assertEqual(BM("abc", engine).count_occurrence("abc"), 1)
+            self.assertEqual(BM.search_multi_pattern("", ["a"], engine), {"a": 0})
+
+    def test_multi_pattern_engines_agree(self):
+        """Test that counts do not depend on the engine."""
+        text = "- Python\n- Python, SQL\n- - - Java\n" * 10
+        patterns = ["Python", "- ", "- - ", "SQL", "Go", "\n-"]
+        expected = BM.search_multi_pattern(text, patterns, "badchar")
+        self.assertEqual(expected["- - "], 20)
+        for engine in ENGINES:
+            self.assertEqual(BM.search_multi_pattern(text, patterns, engine), expected, engine)
+
+    def test_set_pattern(self):
+        """Test that set_pattern rebuilds the tables."""
+        bm = BM("ab", "badchar")
+        bm.set_pattern("ba")
+        self.assertEqual(bm.search_positions("abba"), [2])
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            BM("a", "kmp")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,376 @@
+import re
+import threading
+from collections import Counter, defaultdict
+from algorithms.BKTree import BKTree
+
+# Same tokenization as Levenshtein.search_positions
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+WORD_PATTERN = re.compile(r'\w+')
+
+# Longest token stored as-is. Longer tokens are stored as overlapping windows
+# so any keyword of at most MAX_TOKEN_LENGTH // 2 chars still lands in one of them.
+MAX_TOKEN_LENGTH : int = 255
+
+# Length of the vocabulary n-grams used to find the tokens containing a keyword.
+# Shorter keywords are looked up by scanning the whole vocabulary.
+GRAM_LENGTH : int = 3
+
+class InvertedIndex:
+    def __init__(self):
+        # token -> {document id: term frequency}
+        self.postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self.documents: set[int] = set()
+        # document id -> its tokens, so removing a document only touches its own postings
+        self.document_tokens: dict[int, list[str]] = {}
+        # n-gram -> live tokens containing it, for substring lookups
+        self.grams: dict[str, set[str]] = defaultdict(set)
+        # corpus vocabulary for fuzzy lookups, rebuilt once dead tokens outnumber live ones
+        self.vocabulary: BKTree = BKTree()
+        self.dead_tokens: set[str] = set()  # in the vocabulary but without postings
+        # uploads update the index while a search thread reads it
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def tokenize(text: str) -> Counter:
+        """
+        Counts the tokens of text, splitting over-long tokens into windows.
+        """
+        counts : Counter = Counter()
+        for token in TOKEN_PATTERN.findall(text):
+            if len(token) <= MAX_TOKEN_LENGTH:
+                counts[token] += 1
+                continue
+            step : int = MAX_TOKEN_LENGTH // 2
+            for start in range(0, len(token) - step, step):
+                counts[token[start:start + MAX_TOKEN_LENGTH]] += 1
+        return counts
+
+    @staticmethod
+    def token_grams(token: str) -> set[str]:
+        return {token[i:i + GRAM_LENGTH] for i in range(len(token) - GRAM_LENGTH + 1)}
+
+    def add_posting(self, token: str, doc_id: int, frequency: int) -> None:
+        with self.lock:
+            docs = self.postings.get(token)
+            if docs is None:
+                docs = self.postings[token]
+                if token in self.dead_tokens:
+                    self.dead_tokens.discard(token)
+                else:
+                    self.vocabulary.add(token)
+                for gram in self.token_grams(token):
+                    self.grams[gram].add(token)
+            if doc_id not in docs:
+                self.document_tokens.setdefault(doc_id, []).append(token)
+            docs[doc_id] = frequency
+            self.documents.add(doc_id)
+
+    def add_document(self, doc_id: int, text: str) -> Counter:
+        """
+        Indexes text under doc_id, replacing any previous entry. Returns the token counts.
+        """
+        counts : Counter = self.tokenize(text)
+        self.add_counts(doc_id, counts)
+        return counts
+
+    def add_counts(self, doc_id: int, counts: dict[str, int]) -> None:
+        """
+        Indexes already tokenized counts under doc_id, replacing any previous entry.
+        """
+        with self.lock:
+            self.remove_document(doc_id)
+            for token, frequency in counts.items():
+                self.add_posting(token, doc_id, frequency)
+            self.documents.add(doc_id)
+
+    def remove_document(self, doc_id: int) -> None:
+        with self.lock:
+            if doc_id not in self.documents:
+                return
+            for token in self.document_tokens.pop(doc_id, []):
+                docs = self.postings[token]
+                del docs[doc_id]
+                if not docs:
+                    del self.postings[token]
+                    for gram in self.token_grams(token):
+                        tokens = self.grams[gram]
+                        tokens.discard(token)
+                        if not tokens:
+                            del self.grams[gram]
+                    self.dead_tokens.add(token)
+            self.documents.discard(doc_id)
+
+            if len(self.dead_tokens) > len(self.postings):
+                self.vocabulary.clear()
+                for token in self.postings:
+                    self.vocabulary.add(token)
+                self.dead_tokens.clear()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.postings.clear()
+            self.documents.clear()
+            self.document_tokens.clear()
+            self.grams.clear()
+            self.vocabulary.clear()
+            self.dead_tokens.clear()
+
+    def indexed(self, doc_ids: set[int]) -> set[int]:
+        """
+        Returns the doc_ids that are in the index.
+        """
+        with self.lock:
+            return self.documents & doc_ids
+
+    def matching_tokens(self, keyword: str) -> list[str]:
+        """
+        Returns every indexed token that contains keyword as a substring.
+
+        Only the tokens sharing the keyword's rarest n-gram are checked, which
+        includes the keyword itself when it is a whole token. Keywords shorter
+        than GRAM_LENGTH fall back to scanning the vocabulary.
+        """
+        with self.lock:
+            if len(keyword) < GRAM_LENGTH:
+                return [token for token in self.postings if keyword in token]
+            rarest : set[str] = min((self.grams.get(gram, set()) for gram in self.token_grams(keyword)), key=len)
+            return [token for token in rarest if keyword in token]
+
+    def candidates(self, keywords: list[str]) -> set[int] | None:
+        """
+        Returns the indexed documents that may contain at least one keyword.
+
+        A keyword made only of word characters can only occur inside a single
+        token, so the postings of the tokens containing it are exact. Returns
+        None when some keyword cannot be answered by the index.
+        """
+        result : set[int] = set()
+        with self.lock:
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                if len(keyword) > MAX_TOKEN_LENGTH // 2 or not WORD_PATTERN.fullmatch(keyword):
+                    return None
+                for token in self.matching_tokens(keyword):
+                    result.update(self.postings[token])
+        return result
+
+    def excludes(self, doc_id: int, candidates: set[int] | None) -> bool:
+        """
+        True if doc_id is indexed and known not to contain any keyword.
+        """
+        return candidates is not None and doc_id in self.documents and doc_id not in candidates
+
+    def fuzzy_counts(self, keyword: str, threshold: float = 0.8) -> dict[int, int] | None:
+        """
+        Counts, per indexed document, the tokens whose Levenshtein similarity
+        to keyword is at least threshold, like Levenshtein.count_occurrence.
+        Each vocabulary term is compared once instead of once per occurrence.
+        Returns None when the index cannot answer for this keyword.
+        """
+        # windows of over-long tokens are at least MAX_TOKEN_LENGTH // 2 + 1 chars long,
+        # only keywords at least threshold times that long could be similar to one
+        if threshold <= 0 or len(keyword) >= threshold * (MAX_TOKEN_LENGTH // 2 + 1):
+            return None
+
+        # similarity >= threshold implies distance <= (1 - threshold) * len(keyword) / threshold
+        radius : int = int((1 - threshold) * len(keyword) / threshold) + 1
+        counts : dict[int, int] = defaultdict(int)
+        with self.lock:
+            for token, distance in self.vocabulary.search(keyword, radius):
+                docs = self.postings.get(token)
+                if not docs:
+                    continue  # dead token, removed with its last document
+                max_len : int = max(len(token), len(keyword))
+                if 1 - (distance / max_len) < threshold:
+                    continue
+                for doc_id, frequency in docs.items():
+                    counts[doc_id] += frequency
+        return counts
+
+
+import random
+import sys
+import unittest
+from algorithms.KMP import KMP
+from algorithms.Levenshtein import Levenshtein
+
+class TestInvertedIndex(unittest.TestCase):
+    ALPHABET : str = "abcé1_"
+
+    def random_corpus(self, rng: random.Random, docs: int) -> dict[int, str]:
+        corpus = {}
+        for doc_id in range(docs):
+            words = ["".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(1, 8))) for _ in range(rng.randint(0, 30))]
+            if rng.random() < 0.2:
+                words.append("".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(256, 700))))
+            corpus[doc_id] = rng.choice([" ", ", ", ".\n", " – "]).join(words)
+        return corpus
+
+    def random_keyword(self, rng: random.Random, corpus: dict[int, str]) -> str:
+        text = corpus[rng.randrange(len(corpus))]
+        if text and rng.random() < 0.6:
+            start = rng.randrange(len(text))
+            return text[start:start + rng.randint(1, 10)]  # may span word boundaries
+        return "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(1, 5)))
+
+    def build(self, corpus: dict[int, str]) -> InvertedIndex:
+        index = InvertedIndex()
+        for doc_id, text in corpus.items():
+            index.add_document(doc_id, text)
+        return index
+
+    def test_candidates_never_drop_matches(self):
+        """Test that pruning keeps every document KMP finds a keyword in."""
+        rng = random.Random(0)
+        for _ in range(30):
+            corpus = self.random_corpus(rng, 25)
+            index = self.build(corpus)
+            for _ in range(10):
+                keywords = [self.random_keyword(rng, corpus) for _ in range(rng.randint(1, 4))]
+                candidates = index.candidates(keywords)
+                for doc_id, text in corpus.items():
+                    found = any(KMP(keyword).count_occurence(text) for keyword in keywords)
+                    if found:
+                        self.assertFalse(index.excludes(doc_id, candidates), (keywords, text))
+                    elif candidates is not None:
+                        self.assertTrue(index.excludes(doc_id, candidates), (keywords, text))
+
+    def test_candidates_fallback(self):
+        """Test that keywords the index cannot answer return None and exclude nothing."""
+        index = self.build({1: "python, sql", 2: "java"})
+        self.assertEqual(index.candidates(["python"]), {1})
+        for keywords in (["on, sq"], ["py thon"], ["x" * (MAX_TOKEN_LENGTH // 2 + 1)]):
+            self.assertIsNone(index.candidates(keywords))
+            self.assertFalse(index.excludes(2, index.candidates(keywords)))
+        self.assertFalse(index.excludes(3, set()))  # documents missing from the index are never excluded
+
+    def test_long_token_windows(self):
+        """Test that keywords anywhere inside an over-long token are found."""
+        rng = random.Random(1)
+        token = "".join(rng.choice("abc") for _ in range(1000))
+        index = self.build({1: f"intro {token} outro"})
+        self.assertTrue(all(len(window) <= MAX_TOKEN_LENGTH for window in index.postings))
+        for _ in range(200):
+            start = rng.randrange(len(token))
+            keyword = token[start:start + rng.randint(1, MAX_TOKEN_LENGTH // 2)]
+            self.assertEqual(index.candidates([keyword]), {1}, keyword)
+
+    def test_fuzzy_counts_match_levenshtein(self):
+        """Test vocabulary fuzzy counts against Levenshtein("dp") on every document."""
+        rng = random.Random(2)
+        lv = Levenshtein("dp")
+        for _ in range(20):
+            corpus = self.random_corpus(rng, 15)
+            index = self.build(corpus)
+            for _ in range(15):
+                keyword = "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(1, 9)))
+                threshold = rng.choice([0.5, 0.6, 0.7, 0.75, 0.8, 0.9, 1.0])
+                counts = index.fuzzy_counts(keyword, threshold)
+                self.assertIsNotNone(counts)
+                for doc_id, text in corpus.items():
+                    expected = lv.count_occurrence(text, keyword, threshold)
+                    self.assertEqual(counts.get(doc_id, 0), expected, (keyword, threshold, text))
+
+    def test_fuzzy_counts_fallback(self):
+        """Test that thresholds and keyword lengths the index cannot answer return None."""
+        text = "python " + "a" * 600  # last window of the long token is 219 chars
+        index = self.build({1: text})
+        self.assertIsNone(index.fuzzy_counts("python", 0))
+        self.assertIsNone(index.fuzzy_counts("a" * 103, 0.8))   # could be similar to a 128-char window
+        self.assertEqual(index.fuzzy_counts("a" * 102, 0.8), {})
+        self.assertEqual(index.fuzzy_counts("pyhton", 0.6), {1: 1})
+
+        lv = Levenshtein("dp")
+        for length in range(80, 260, 3):
+            for threshold in (0.6, 0.8, 0.95):
+                counts = index.fuzzy_counts("a" * length, threshold)
+                if counts is not None:
+                    self.assertEqual(counts.get(1, 0), lv.count_occurrence(text, "a" * length, threshold), (length, threshold))
+
+    def test_remove_and_replace(self):
+        """Test that re-indexing a document drops its old tokens."""
+        index = self.build({1: "python sql", 2: "python"})
+        index.add_document(1, "java")
+        self.assertEqual(index.candidates(["python"]), {2})
+        self.assertEqual(index.candidates(["sql"]), set())
+        index.remove_document(2)
+        self.assertEqual(index.candidates(["python"]), set())
+        self.assertNotIn("python", index.postings)
+
+    def test_matching_tokens(self):
+        """Test the n-gram lookup against scanning the whole vocabulary."""
+        rng = random.Random(3)
+        corpus = self.random_corpus(rng, 40)
+        index = self.build(corpus)
+        for _ in range(300):
+            keyword = self.random_keyword(rng, corpus)
+            expected = sorted(token for token in index.postings if keyword in token)
+            self.assertEqual(sorted(index.matching_tokens(keyword)), expected, keyword)
+
+    def test_removal_matches_rebuild(self):
+        """Test that removing documents leaves the same index as building the rest from scratch."""
+        rng = random.Random(4)
+        for _ in range(10):
+            corpus = self.random_corpus(rng, 30)
+            index = self.build(corpus)
+            for doc_id in rng.sample(sorted(corpus), 20):
+                index.remove_document(doc_id)
+                del corpus[doc_id]
+            fresh = self.build(corpus)
+            self.assertEqual(dict(index.postings), dict(fresh.postings))
+            self.assertEqual(dict(index.grams), dict(fresh.grams))
+            self.assertEqual(index.documents, fresh.documents)
+            for _ in range(10):
+                keyword = "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(1, 6)))
+                self.assertEqual(index.fuzzy_counts(keyword, 0.6), fresh.fuzzy_counts(keyword, 0.6), keyword)
+
+    def test_vocabulary_pruned(self):
+        """Test that the vocabulary is rebuilt once dead tokens outnumber live ones."""
+        index = self.build({doc_id: f"python token{doc_id}" for doc_id in range(10)})
+        self.assertEqual(index.vocabulary.size, 11)
+        for doc_id in range(5):
+            index.remove_document(doc_id)
+        self.assertEqual(index.dead_tokens, {f"token{doc_id}" for doc_id in range(5)})
+        self.assertEqual(index.fuzzy_counts("token0", 0.8), {doc_id: 1 for doc_id in range(5, 10)})
+        index.add_document(0, "token0")  # revived, already in the vocabulary
+        self.assertNotIn("token0", index.dead_tokens)
+        index.remove_document(5)
+        self.assertEqual(len(index.dead_tokens), 5)
+        index.remove_document(6)  # 6 dead tokens, 5 live ones
+        self.assertEqual(index.dead_tokens, set())
+        self.assertEqual(sorted(term for term, _ in index.vocabulary.search("token", 2)), ["token0", "token7", "token8", "token9"])
+        self.assertEqual(index.vocabulary.size, 5)
+
+    def test_concurrent_updates(self):
+        """Test that queries do not fail while another thread indexes documents."""
+        index = InvertedIndex()
+        for doc_id in range(50):
+            index.add_document(doc_id, f"python java sql token{doc_id}")
+        errors = []
+
+        def upload():
+            try:
+                for doc_id in range(50, 2000):
+                    index.add_document(doc_id, f"python golang token{doc_id} word{doc_id * 7}")
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads often enough to hit a race
+        try:
+            thread = threading.Thread(target=upload)
+            thread.start()
+            while thread.is_alive():
+                index.candidates(["token1", "python"])
+                index.fuzzy_counts("tokne12", 0.7)
+                index.indexed(set(range(2000)))
+            thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(index.documents), 2000)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,9 +1,21 @@
 import re
+
+ENGINES : tuple[str, ...] = ("dp", "myers")
+DEFAULT_ENGINE : str = "myers"
+
 class Levenshtein:
-    def __init__(self):
-        pass
+    def __init__(self, engine: str = DEFAULT_ENGINE):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown Levenshtein engine: {engine}")
+        self.engine = engine
 
     def calculate_distance(self, s1: str, s2: str) -> int:
+        if self.engine == "myers":
+            return self.myers_distance(self.myers_pattern(s2), len(s2), s1)
+        return self.dp_distance(s1, s2)
+
+    @staticmethod
+    def dp_distance(s1: str, s2: str) -> int:
         if len(s1) > len(s2):
             s1, s2 = s2, s1
 
@@ -26,6 +38,102 @@ class Levenshtein:
             previous_row = current_row
         return previous_row[len_s1]
 
+    @staticmethod
+    def myers_pattern(pattern: str) -> dict[str, int]:
+        """
+        Builds Myers' match masks: bit i of peq[c] is set when pattern[i] == c.
+        """
+        peq : dict[str, int] = {}
+        for i, char in enumerate(pattern):
+            peq[char] = peq.get(char, 0) | (1 << i)
+        return peq
+
+    @staticmethod
+    def myers_distance(peq: dict[str, int], pattern_len: int, text: str) -> int:
+        """
+        Edit distance between the pattern described by peq and text, using
+        Myers' bit-vector algorithm (Hyyro's global-distance form). A whole
+        DP column is held in Python ints, so each char of text costs a fixed
+        number of word operations instead of pattern_len cell updates.
+        """
+        if pattern_len == 0:
+            return len(text)
+
+        mask : int = (1 << pattern_len) - 1
+        high : int = 1 << (pattern_len - 1)
+        pv : int = mask     # vertical +1 deltas
+        mv : int = 0        # vertical -1 deltas
+        score : int = pattern_len
+
+        for char in text:
+            eq : int = peq.get(char, 0)
+            xv : int = eq | mv
+            xh : int = (((eq & pv) + pv) ^ pv) | eq
+            ph : int = mv | (~(xh | pv) & mask)
+            mh : int = pv & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            # row 0 grows by one per char of text, so a +1 is shifted in
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+        return score
+
+    @staticmethod
+    def max_distance(max_len: int, threshold: float) -> int:
+        """
+        Largest edit distance d with 1 - d/max_len >= threshold, or -1 if none.
+        """
+        if max_len == 0:
+            return 0 if threshold <= 1 else -1
+        distance : int = min(max_len, int((1 - threshold) * max_len) + 1)
+        # step down so float rounding agrees with calculate_similarity_percentage
+        while distance >= 0 and 1 - (distance / max_len) < threshold:
+            distance -= 1
+        return distance
+
+    @staticmethod
+    def bounded_distance(s1: str, s2: str, max_distance: int) -> int:
+        """
+        Edit distance of s1 and s2 if it is at most max_distance, else max_distance + 1.
+
+        Only the diagonal band |i - j| <= max_distance can hold cells within the
+        bound (Ukkonen), and the DP stops as soon as a whole row exceeds it.
+        """
+        if len(s1) > len(s2):
+            s1, s2 = s2, s1
+
+        len_s1 = len(s1)
+        len_s2 = len(s2)
+        over : int = max_distance + 1
+        if len_s2 - len_s1 > max_distance:
+            return over
+        if len_s1 == 0:
+            return len_s2
+
+        previous_row = [j if j <= max_distance else over for j in range(len_s1 + 1)]
+        for i in range(1, len_s2 + 1):
+            current_row = [over] * (len_s1 + 1)
+            if i <= max_distance:
+                current_row[0] = i
+            row_min : int = current_row[0]
+            char : str = s2[i-1]
+
+            for j in range(max(1, i - max_distance), min(len_s1, i + max_distance) + 1):
+                cost = previous_row[j-1] if s1[j-1] == char else previous_row[j-1] + 1
+                cost = min(cost, current_row[j-1] + 1, previous_row[j] + 1, over)
+                current_row[j] = cost
+                if cost < row_min:
+                    row_min = cost
+
+            if row_min > max_distance:
+                return over
+            previous_row = current_row
+        return previous_row[len_s1]
+
     def calculate_similarity_percentage(self, s1: str, s2: str) -> float:
         if (len(s1) == 0 and len(s2) == 0) : return 1
 
@@ -34,11 +142,34 @@ class Levenshtein:
         return 1 - (distance/max_len)
 
     def are_strings_similar(self, s1: str, s2: str, threshold: float) -> bool:
-        return self.calculate_similarity_percentage(s1, s2) >= threshold
+        max_len : int = max(len(s1), len(s2))
+        max_distance : int = self.max_distance(max_len, threshold)
+        # hopeless pairs are rejected on length alone, before any DP
+        if abs(len(s1) - len(s2)) > max_distance:
+            return False
+        if self.engine == "myers":
+            return self.calculate_distance(s1, s2) <= max_distance
+        return self.bounded_distance(s1, s2, max_distance) <= max_distance
     
     def search_positions(self, text: str, pattern: str, threshold: float) -> list[int]:
         result: list[int] = []
         word_iterator = re.finditer(r'\b\w+\b', text)
+
+        if self.engine == "myers":
+            # the keyword's match masks are built once and reused for every word
+            peq : dict[str, int] = self.myers_pattern(pattern)
+            bounds : dict[int, int] = {}
+            for match in word_iterator:
+                word = match.group(0)
+                max_len : int = max(len(word), len(pattern))
+                if max_len not in bounds:
+                    bounds[max_len] = self.max_distance(max_len, threshold)
+                max_distance : int = bounds[max_len]
+                if abs(len(word) - len(pattern)) > max_distance:
+                    continue
+                if self.myers_distance(peq, len(pattern), word) <= max_distance:
+                    result.append(match.start())
+            return result
         
         for match in word_iterator:
             word = match.group(0)
@@ -51,12 +182,63 @@ class Levenshtein:
         return len(self.search_positions(text, pattern, threshold))
     
     @staticmethod
-    def search_multi_pattern(text: str, patterns: list[str]) -> dict[str, int]:
+    def search_multi_pattern(text: str, patterns: list[str], engine: str = DEFAULT_ENGINE, threshold: float = 0.8) -> dict[str, int]:
         results : dict[str, int] = {}
         if not text or not patterns: return results
 
-        lv : object = Levenshtein()
+        lv : object = Levenshtein(engine)
         for pattern in patterns:
-            num_occurrences = lv.count_occurrence(text, pattern)
+            num_occurrences = lv.count_occurrence(text, pattern, threshold)
             results[pattern] = num_occurrences
-        return results
\ No newline at end of file
+        return results
+
+import random
+import unittest
+
+class TestLevenshtein(unittest.TestCase):
+    def test_known_distances(self):
+        """Test classic examples on both engines."""
+        cases = [("kitten", "sitting", 3), ("flaw", "lawn", 2), ("", "abc", 3), ("abc", "", 3), ("same", "same", 0)]
+        for engine in ENGINES:
+            lv = Levenshtein(engine)
+            for s1, s2, expected in cases:
+                self.assertEqual(lv.calculate_distance(s1, s2), expected)
+
+    def test_myers_matches_dp(self):
+        """Test Myers' bit-vector distance against the dynamic program on random strings."""
+        rng = random.Random(13)
+        myers = Levenshtein("myers")
+        for _ in range(2000):
+            s1 = "".join(rng.choice("abcé") for _ in range(rng.randint(0, 12)))
+            s2 = "".join(rng.choice("abcé") for _ in range(rng.randint(0, 12)))
+            self.assertEqual(myers.calculate_distance(s1, s2), Levenshtein.dp_distance(s1, s2))
+
+    def test_multi_pattern_engines_agree(self):
+        """Test that fuzzy counts do not depend on the engine."""
+        text = "Experienced project manajer with strong managment and python skills, pyton"
+        patterns = ["manager", "management", "python", "java"]
+        self.assertEqual(
+            Levenshtein.search_multi_pattern(text, patterns, "myers"),
+            Levenshtein.search_multi_pattern(text, patterns, "dp")
+        )
+
+    def test_bounded_distance(self):
+        """Test the banded DP against the full DP, inside and outside the bound."""
+        rng = random.Random(29)
+        for _ in range(2000):
+            s1 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 10)))
+            s2 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 10)))
+            bound = rng.randint(0, 6)
+            full = Levenshtein.dp_distance(s1, s2)
+            self.assertEqual(Levenshtein.bounded_distance(s1, s2, bound), min(full, bound + 1))
+
+    def test_similarity_uses_threshold(self):
+        """Test that the bounded check agrees with the similarity percentage."""
+        lv = Levenshtein("dp")
+        for s1, s2 in [("python", "pyton"), ("manager", "manajer"), ("java", "javascript"), ("", ""), ("a", "")]:
+            for threshold in (0.5, 0.8, 0.9):
+                expected = lv.calculate_similarity_percentage(s1, s2) >= threshold
+                self.assertEqual(lv.are_strings_similar(s1, s2, threshold), expected)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,168 @@
+import unittest
+from collections import defaultdict
+from functools import lru_cache
+from algorithms.BM import BM
+
+BLOCK_SIZE : int = 2 # chars per hashed block, 3 for large keyword sets
+LARGE_SET_SIZE : int = 32 # keyword sets at least this big use 3-char blocks when all keywords allow it
+MIN_PATTERN_LENGTH : int = 3 # shorter keywords would cap every shift, they are counted with Boyer-Moore instead
+COMPILED_CACHE_SIZE : int = 32 # keyword sets whose SHIFT/HASH tables are kept, the GUI repeats the same list
+
+class WuManber:
+    """
+    Wu-Manber multi-pattern search: one pass over the text for any number of keywords.
+
+    The window is the length m of the shortest keyword. Its last block of B chars
+    gives the shift through a hash table; blocks that end some keyword's first m
+    chars have shift 0 and only then are those keywords compared in place.
+    Every keyword is counted with overlapping occurrences, like KMP and BM.
+    """
+    def __init__(self, patterns: list[str]):
+        self.patterns : list[str] = patterns
+        # keywords the block scan can handle, each once
+        self.long_patterns : list[str] = list(dict.fromkeys(p for p in patterns if len(p) >= MIN_PATTERN_LENGTH))
+        self.short_patterns : list[str] = list(dict.fromkeys(p for p in patterns if 0 < len(p) < MIN_PATTERN_LENGTH))
+
+        self.m : int = min(map(len, self.long_patterns), default=0)
+        large : bool = len(self.long_patterns) >= LARGE_SET_SIZE
+        self.block : int = min(3 if large else BLOCK_SIZE, self.m)
+        self.default_shift : int = self.m - self.block + 1
+
+        self.shift : dict[str, int] = {}         # block -> safe shift, missing blocks use default_shift
+        self.hash : dict[str, list[str]] = {}    # block -> keywords whose m-prefix ends with it
+        self.build()
+
+    def build(self) -> None:
+        m : int = self.m
+        block : int = self.block
+        for pattern in self.long_patterns:
+            for end in range(block, m + 1):
+                key : str = pattern[end - block:end]
+                shift : int = m - end
+                if shift < self.shift.get(key, self.default_shift):
+                    self.shift[key] = shift
+            self.hash.setdefault(pattern[m - block:m], []).append(pattern)
+
+    def count_occurrences(self, text: str) -> dict[str, int]:
+        counts : dict[str, int] = defaultdict(int)
+
+        if self.long_patterns and len(text) >= self.m:
+            m : int = self.m
+            block : int = self.block
+            default : int = self.default_shift
+            shift_get = self.shift.get
+            candidates = self.hash
+            startswith = text.startswith
+            n : int = len(text)
+
+            i : int = m # end of the window, exclusive
+            while i <= n:
+                key : str = text[i - block:i]
+                shift : int = shift_get(key, default)
+                if shift:
+                    i += shift
+                    continue
+                start : int = i - m
+                for pattern in candidates[key]:
+                    if startswith(pattern, start):
+                        counts[pattern] += 1
+                i += 1
+
+        if self.short_patterns:
+            counts.update(BM.search_multi_pattern(text, self.short_patterns, "horspool"))
+
+        return {p: counts[p] for p in self.patterns}
+
+    @staticmethod
+    def compile(patterns: list[str]) -> "WuManber":
+        """
+        Returns a WuManber for patterns with its SHIFT and HASH tables built.
+        Building visits every block of every keyword's first m chars, so a
+        keyword list searched again reuses the same tables. There is no
+        PREFIX table: the few keywords under a HASH entry are compared with
+        startswith directly.
+        """
+        return _compile(tuple(patterns))
+
+    @staticmethod
+    def search_multi_pattern(text: str, patterns: list[str]) -> dict[str, int]:
+        if not text or not patterns:
+            return {p: 0 for p in patterns}
+
+        return WuManber.compile(patterns).count_occurrences(text)
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(patterns: tuple[str, ...]) -> WuManber:
+    return WuManber(list(patterns))
+
+
+from algorithms.oracle import UNICODE_TEXT, UNICODE_COUNTS, brute_force_counts, random_cases
+
+class TestWuManber(unittest.TestCase):
+    def test_multi_pattern_count(self):
+        """Test overlapping and nested patterns."""
+        text = "she sells sea shells on the sea shore"
+        patterns = ["she", "shells", "sea", "ells", "xyz", "he"]
+        self.assertEqual(WuManber.search_multi_pattern(text, patterns), brute_force_counts(text, patterns))
+
+    def test_matches_brute_force(self):
+        """Test random keyword sets on small alphabets, including short and duplicate keywords."""
+        for text, patterns in random_cases(0, 300, 80, 7, 40):
+            self.assertEqual(WuManber.search_multi_pattern(text, patterns), brute_force_counts(text, patterns), (text, patterns))
+
+    def test_overlapping(self):
+        """Test that occurrences may overlap, like KMP and BM."""
+        self.assertEqual(WuManber.search_multi_pattern("aaaaa", ["aaa", "aaaa"]), {"aaa": 3, "aaaa": 2})
+
+    def test_large_keyword_set(self):
+        """Test 3-char blocks on a large keyword set."""
+        patterns = [f"skill{i}x" for i in range(LARGE_SET_SIZE)] + ["Python"]
+        text = "skill1x skill12x Python skill31x " * 3
+        self.assertEqual(WuManber.compile(patterns).block, 3)
+        self.assertEqual(WuManber.search_multi_pattern(text, patterns), brute_force_counts(text, patterns))
+
+    def test_unicode_text(self):
+        """Test that non-ascii chars in text and patterns still match."""
+        self.assertEqual(WuManber.search_multi_pattern(UNICODE_TEXT, list(UNICODE_COUNTS)), UNICODE_COUNTS)
+
+    def test_shift_table(self):
+        """Test the SHIFT and HASH tables of a small keyword set."""
+        wm = WuManber(["abcd", "xbcz", "ab"])
+        self.assertEqual((wm.m, wm.block, wm.default_shift), (4, 2, 3))
+        self.assertEqual(wm.shift, {"ab": 2, "bc": 1, "cd": 0, "xb": 2, "cz": 0})
+        self.assertEqual(wm.hash, {"cd": ["abcd"], "cz": ["xbcz"]})
+        self.assertEqual(wm.short_patterns, ["ab"])
+
+    def test_window_is_shortest_keyword(self):
+        """Test that a keyword only as long as the window is found at every shift."""
+        wm = WuManber(["abc", "abcabcabc"])
+        self.assertEqual((wm.m, wm.default_shift), (3, 2))
+        text = "xxabcabcabcxabc"
+        self.assertEqual(wm.count_occurrences(text), brute_force_counts(text, ["abc", "abcabcabc"]))
+
+    def test_block_equals_window(self):
+        """Test 3-char keywords with 3-char blocks, where every shift is 0 or 1."""
+        patterns = [f"{chr(97 + i % 26)}{i % 10}{chr(65 + i // 10)}" for i in range(LARGE_SET_SIZE)]
+        wm = WuManber.compile(patterns)
+        self.assertEqual((wm.m, wm.block, wm.default_shift), (3, 3, 1))
+        self.assertEqual(set(wm.shift.values()), {0})
+        text = "".join(patterns[::3]) + "zzz" + patterns[-1]
+        self.assertEqual(WuManber.search_multi_pattern(text, patterns), brute_force_counts(text, patterns))
+
+    def test_text_shorter_than_window(self):
+        """Test text shorter than the shortest long keyword, with short keywords still counted."""
+        self.assertEqual(WuManber.search_multi_pattern("ab a", ["abcd", "ab", "a"]), {"abcd": 0, "ab": 1, "a": 2})
+
+    def test_edge_cases(self):
+        """Test empty inputs, empty keywords and keywords longer than the text."""
+        self.assertEqual(WuManber.search_multi_pattern("", ["abc"]), {"abc": 0})
+        self.assertEqual(WuManber.search_multi_pattern("abc", []), {})
+        self.assertEqual(WuManber.search_multi_pattern("abc", ["", "abcd", "abc"]), {"": 0, "abcd": 0, "abc": 1})
+
+    def test_compile_is_cached(self):
+        """Test that the same keyword set reuses one table."""
+        self.assertIs(WuManber.compile(["cv", "hr"]), WuManber.compile(["cv", "hr"]))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the exact matching engines' tests: a brute-force reference
+and random cases over small alphabets, where shifts, borders and overlapping
+matches are frequent.
+"""
+import random
+
+ALPHABETS : tuple[str, ...] = ("ab", "abc", "a b-", "aé–")
+
+# non-ascii text, with a keyword made only of non-ascii chars and one occurring inside others
+UNICODE_TEXT : str = "José Pérez – “Manajer” • Jakarta, Pérez"
+UNICODE_COUNTS : dict[str, int] = {"Pérez": 2, "“Manajer”": 1, "Jakarta": 1, "é": 3}
+
+def brute_force_positions(text: str, pattern: str) -> list[int]:
+    """
+    Every start of pattern in text, overlaps included. An empty pattern never matches.
+    """
+    if not pattern:
+        return []
+    return [i for i in range(len(text) - len(pattern) + 1) if text.startswith(pattern, i)]
+
+def brute_force_counts(text: str, patterns: list[str]) -> dict[str, int]:
+    return {pattern: len(brute_force_positions(text, pattern)) for pattern in patterns}
+
+def random_cases(seed: int, cases: int, max_text: int, max_pattern: int, max_patterns: int = 1):
+    """
+    Yields (text, patterns) pairs drawn from one of ALPHABETS each, with
+    1..max_patterns patterns of 1..max_pattern chars. Patterns may repeat.
+    """
+    rng = random.Random(seed)
+    for _ in range(cases):
+        alphabet = rng.choice(ALPHABETS)
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_text)))
+        patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, max_pattern))) for _ in range(rng.randint(1, max_patterns))]
+        yield text, patterns
@@ -0,0 +1,108 @@
+"""
+Offline micro-benchmark of the matching engines on a synthetic CV corpus.
+No database or GUI needed. Run from the repository root:
+
+    python src/benchmarks/bench_matching.py --docs 500 --keywords 6 --output bench.json
+    python src/benchmarks/bench_matching.py --compare bench.json
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.KMP import KMP
+from algorithms.BM import BM
+from algorithms.AhoCorasick import AhoCorasick
+from algorithms.WuManber import WuManber
+from algorithms.Levenshtein import Levenshtein
+from benchmarks.corpus import generate_corpus, generate_keywords
+from benchmarks.report import percentiles, make_report, write_report, load_report, compare_reports
+
+# name -> (kind, search function(text, keywords) -> {keyword: count})
+ENGINES = {
+    "KMP": ("exact", KMP.search_multi_pattern),
+    "BM-badchar": ("exact", lambda text, keywords: BM.search_multi_pattern(text, keywords, engine="badchar")),
+    "BM-full": ("exact", lambda text, keywords: BM.search_multi_pattern(text, keywords, engine="full")),
+    "BM-horspool": ("exact", lambda text, keywords: BM.search_multi_pattern(text, keywords, engine="horspool")),
+    "BM-sunday": ("exact", lambda text, keywords: BM.search_multi_pattern(text, keywords, engine="sunday")),
+    "AhoCorasick-trie": ("exact", lambda text, keywords: AhoCorasick.search_multi_pattern(text, keywords, engine="trie")),
+    "AhoCorasick-dfa": ("exact", lambda text, keywords: AhoCorasick.search_multi_pattern(text, keywords, engine="dfa")),
+    "WuManber": ("exact", WuManber.search_multi_pattern),
+    "Levenshtein-dp": ("fuzzy", lambda text, keywords: Levenshtein.search_multi_pattern(text, keywords, engine="dp")),
+    "Levenshtein-myers": ("fuzzy", lambda text, keywords: Levenshtein.search_multi_pattern(text, keywords, engine="myers")),
+}
+
+def bench_engine(search, corpus: list[str], keywords: list[str], repeat: int) -> tuple[dict, list[dict]]:
+    """
+    One query is one search of all keywords in one CV. Returns throughput and
+    latency percentiles, plus the counts of the first pass for cross-checking.
+    """
+    latencies = []
+    matches = 0
+    counts = []
+    for i in range(repeat):
+        for text in corpus:
+            start = time.perf_counter()
+            result = search(text, keywords)
+            latencies.append(time.perf_counter() - start)
+            matches += sum(result.values())
+            if i == 0:
+                counts.append({keyword: result.get(keyword, 0) for keyword in keywords})
+
+    total = sum(latencies)
+    scanned_mb = repeat * sum(len(text.encode("utf-8")) for text in corpus) / 1e6
+    result = {
+        "queries": len(latencies),
+        "total_s": round(total, 6),
+        "mb_per_s": round(scanned_mb / total, 4) if total else 0.0,
+        "matches": matches // repeat,
+    }
+    result.update({f"{k}_ms": round(v * 1e3, 4) for k, v in percentiles(latencies).items()})
+    return result, counts
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=300, help="number of synthetic CVs")
+    parser.add_argument("--words", type=int, default=60, help="words per CV section")
+    parser.add_argument("--keywords", type=int, default=6, help="keywords per query")
+    parser.add_argument("--keyword-length", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=list(ENGINES))
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare MB/s against a previous report")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before flagging, as a fraction")
+    args = parser.parse_args(argv)
+
+    params = {
+        "docs": args.docs, "words": args.words, "keywords": args.keywords,
+        "keyword_length": args.keyword_length, "repeat": args.repeat, "seed": args.seed,
+    }
+    corpus = generate_corpus(args.docs, args.words, args.seed)
+    keywords = generate_keywords(args.keywords, args.keyword_length, args.seed)
+
+    results = {}
+    reference = {}  # kind -> (engine name, counts) of the first engine of that kind
+    for name in args.engines:
+        kind, search = ENGINES[name]
+        result, counts = bench_engine(search, corpus, keywords, args.repeat)
+        # an engine swap is only safe if every engine of a kind finds the same counts
+        reference_name, reference_counts = reference.setdefault(kind, (name, counts))
+        results[name] = {"kind": kind, **result, "agrees_with": reference_name if counts == reference_counts else None}
+        if counts != reference_counts:
+            print(f"Warning: {name} counts differ from {reference_name}", file=sys.stderr)
+        print(f"{name:>20}: {results[name]['mb_per_s']:10.3f} MB/s  p50 {results[name]['p50_ms']:.3f} ms", file=sys.stderr)
+
+    report = make_report("matching", params, results)
+    report["keywords"] = keywords
+    write_report(report, args.output)
+
+    if args.compare:
+        regressions = compare_reports(load_report(args.compare), report, "mb_per_s", higher_is_better=True, tolerance=args.tolerance)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
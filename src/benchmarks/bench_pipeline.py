@@ -0,0 +1,144 @@
+"""
+End-to-end benchmark of run_search_algorithm on a synthetic PDF corpus,
+with database.db swapped for an in-memory stand-in. For every corpus size it
+runs a cold search (PDF extraction, key decryption) and a warm one, and
+reports the seconds spent in each stage. Run from the repository root:
+
+    python src/benchmarks/bench_pipeline.py --sizes 1000 10000 --save-baseline bench_pipeline.json
+    python src/benchmarks/bench_pipeline.py --sizes 1000 10000 --baseline bench_pipeline.json
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database.db as db
+import interface
+from benchmarks.memory_db import InMemoryDatabase
+from benchmarks.pdf_corpus import generate_pdf_corpus
+from benchmarks.report import make_report, write_report, load_report, compare_reports
+
+STAGES = ("load", "fetch", "decrypt", "extract", "backfill", "index", "exact", "fuzzy", "rank")
+
+class StageTimer():
+    """
+    Accumulates the wall time spent inside wrapped functions, per stage.
+    """
+    def __init__(self):
+        self.totals : dict[str, float] = defaultdict(float)
+
+    def wrap(self, stage: str, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.totals[stage] += time.perf_counter() - start
+        return timed
+
+    def wrap_iter(self, stage: str, func):
+        def timed(*args, **kwargs):
+            iterator = func(*args, **kwargs)
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.totals[stage] += time.perf_counter() - start
+                yield item
+        return timed
+
+    @contextlib.contextmanager
+    def install(self):
+        with contextlib.ExitStack() as stack:
+            patches = [
+                (interface, "iter_search_data", "load", self.wrap_iter),
+                (interface, "get_token_index", "index", self.wrap),
+                (db, "iter_applicant_rows", "fetch", self.wrap_iter),
+                (db, "decrypt_applicants", "decrypt", self.wrap),
+                (db, "extract_text_from_pdf", "extract", self.wrap),
+                (db, "store_cv_text", "backfill", self.wrap),
+            ]
+            for module, name, stage, wrap in patches:
+                stack.enter_context(mock.patch.object(module, name, wrap(stage, getattr(module, name))))
+            yield self
+
+def run_search(algorithm: str, keywords: list[str], limit: int, workers: int) -> dict:
+    timer = StageTimer()
+    start = time.perf_counter()
+    with timer.install(), contextlib.redirect_stdout(sys.stderr):
+        results, exact_ms, fuzzy_ms = interface.run_search_algorithm(algorithm, keywords, limit=limit, workers=workers)
+    total = time.perf_counter() - start
+
+    stages = dict(timer.totals)
+    stages["exact"] = exact_ms / 1000
+    stages["fuzzy"] = fuzzy_ms / 1000
+    # batching, top-k merge and ranking: whatever the measured stages do not cover
+    stages["rank"] = max(0.0, total - stages["load"] - stages.get("index", 0) - stages["exact"] - stages["fuzzy"])
+    result = {f"{stage}_s": round(stages.get(stage, 0.0), 6) for stage in STAGES}
+    result["total_s"] = round(total, 6)
+    result["results"] = len(results)
+    return result
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="number of CVs per run")
+    parser.add_argument("--algorithm", default="AhoCorasick", choices=["KMP", "BM", "AhoCorasick", "WuManber"])
+    parser.add_argument("--keywords", nargs="+", default=["Python", "SQL", "Leadership", "Excel", "Pythn"])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pdf-dir", default=".cache/bench_pdfs", help="where the generated PDFs are kept between runs")
+    parser.add_argument("--store-text", action="store_true", help="store CV text at ingest instead of extracting on first search")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="flag stages slower than this stored report")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also write the report here as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed slowdown before flagging, as a fraction")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        print(f"Preparing {size} CVs ...", file=sys.stderr)
+        paths = generate_pdf_corpus(args.pdf_dir, size, args.seed)
+        database = InMemoryDatabase()
+        with tempfile.TemporaryDirectory() as cache_dir, database.install(cache_dir):
+            start = time.perf_counter()
+            database.add_applicants(paths, args.seed, args.store_text)
+            ingest = time.perf_counter() - start
+            for phase in ("cold", "warm"):
+                result = run_search(args.algorithm, args.keywords, args.limit, args.workers)
+                if phase == "cold":
+                    result["ingest_s"] = round(ingest, 6)
+                results[f"{size}/{phase}"] = result
+                print(f"{size:>7} {phase}: {result['total_s']:.3f} s", file=sys.stderr)
+
+    params = {
+        "sizes": args.sizes, "algorithm": args.algorithm, "keywords": args.keywords, "limit": args.limit,
+        "workers": args.workers, "seed": args.seed, "store_text": args.store_text,
+    }
+    report = make_report("pipeline", params, results)
+    write_report(report, args.output)
+    if args.save_baseline:
+        write_report(report, args.save_baseline)
+
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        regressions = set()
+        for metric in ("total_s",) + tuple(f"{stage}_s" for stage in STAGES):
+            regressions.update(compare_reports(baseline, report, metric, higher_is_better=False, tolerance=args.tolerance, min_delta=args.min_delta))
+        if regressions:
+            print(f"Regressions: {', '.join(sorted(regressions))}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Side-by-side timings of the engine variants kept in the algorithm and
+encryption modules: Boyer-Moore engines, Wu-Manber against one Boyer-Moore
+pass per keyword, ECC scalar multiplication engines and the SPN cipher.
+Run from the repository root:
+
+    python src/benchmarks/bench_variants.py
+    python src/benchmarks/bench_variants.py bm wu-manber
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import encryption.ecc as ecc
+import encryption.spn as spn
+from algorithms.BM import BM, ENGINES as BM_ENGINES
+from algorithms.WuManber import WuManber
+
+def benchmark_bm(repeat: int = 20) -> None:
+    """
+    Times every engine on ordinary CV text and on repetitive bullet lists.
+    """
+    texts = {
+        "cv text": "Experienced software engineer skilled in Python, SQL and data pipelines. " * 200,
+        "repetitive": "- - - - - - - - - - - - - - - - Python\n" * 200,
+    }
+    patterns = ["Python", "pipelines", "- - - - - - - - ", "Kubernetes"]
+    for label, text in texts.items():
+        print(f"{label} ({len(text)} chars, {len(patterns)} patterns):")
+        for engine in BM_ENGINES:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                BM.search_multi_pattern(text, patterns, engine)
+            print(f"  {engine:>8}: {(time.perf_counter() - start) / repeat * 1e3:8.3f} ms per query")
+
+def benchmark_wu_manber(repeat: int = 10) -> None:
+    """
+    Times Wu-Manber against one Boyer-Moore pass per keyword on a 40-skill query.
+    """
+    skills = ["Python", "Java", "SQL", "Docker", "Kubernetes", "React", "Django", "Flask", "Spark", "Hadoop",
+              "Tableau", "Excel", "Figma", "Linux", "Git", "AWS", "Azure", "Terraform", "Ansible", "Jenkins",
+              "Pandas", "NumPy", "TensorFlow", "PyTorch", "Scala", "Kotlin", "Swift", "Golang", "Rust", "Redis",
+              "MongoDB", "PostgreSQL", "MySQL", "Kafka", "Airflow", "Snowflake", "Looker", "Jira", "Agile", "Scrum"]
+    text = ("Experienced engineer building data pipelines with Python and SQL on AWS, "
+            "shipping React front ends and Docker based services with Git and Jenkins. ") * 100
+
+    for label, search in (("BM x 40", lambda: BM.search_multi_pattern(text, skills, "horspool")),
+                          ("Wu-Manber", lambda: WuManber.search_multi_pattern(text, skills))):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            search()
+        print(f"{label:>10}: {(time.perf_counter() - start) / repeat * 1e3:8.3f} ms per query ({len(text)} chars)")
+
+def benchmark_scalar_multiplication(rounds : int = 200) -> None:
+    """
+    Times every engine on random 128-bit scalars over G128 and prints the mean per multiplication.
+    """
+    curve = ecc.EllipticCurve()
+    scalars = [random.randint(1, curve.p - 1) for _ in range(rounds)]
+    for engine in ecc.ENGINES:
+        start = time.perf_counter()
+        for k in scalars:
+            ecc.scalar_multiplication(k, ecc.G128, curve, engine)
+        elapsed = time.perf_counter() - start
+        print(f"{engine:>8}: {elapsed / rounds * 1e6:8.1f} us per scalar multiplication")
+
+    d = random.randint(1, curve.p - 1)
+    points = [ecc.scalar_multiplication(k, ecc.G128, curve) for k in scalars]
+    start = time.perf_counter()
+    ecc.batch_scalar_multiplication([d] * rounds, points, curve)
+    elapsed = time.perf_counter() - start
+    print(f"{'batch':>8}: {elapsed / rounds * 1e6:8.1f} us per scalar multiplication ({rounds} points)")
+
+def benchmark_spn(fields: int = 2000) -> None:
+    """
+    Times the original block-at-a-time cipher, encrypt and encrypt_many on address-sized fields.
+    """
+    key = bytes(range(32))
+    plaintexts = [f"Jl. Ganesha No. {i}, Bandung, Jawa Barat 40132" for i in range(fields)]
+
+    start = time.perf_counter()
+    for plaintext in plaintexts:
+        spn.reference_encrypt(plaintext, key)
+    print(f"   reference: {(time.perf_counter() - start) / fields * 1e6:8.2f} us per field")
+
+    start = time.perf_counter()
+    for plaintext in plaintexts:
+        spn.encrypt(plaintext, key)
+    print(f"     encrypt: {(time.perf_counter() - start) / fields * 1e6:8.2f} us per field")
+
+    start = time.perf_counter()
+    spn.encrypt_many(plaintexts, key)
+    print(f"encrypt_many: {(time.perf_counter() - start) / fields * 1e6:8.2f} us per field")
+
+BENCHMARKS = {
+    "bm": benchmark_bm,
+    "wu-manber": benchmark_wu_manber,
+    "ecc": benchmark_scalar_multiplication,
+    "spn": benchmark_spn,
+}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK", help=f"any of {', '.join(BENCHMARKS)}, all by default")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"== {name}")
+        BENCHMARKS[name]()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
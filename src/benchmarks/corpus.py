@@ -0,0 +1,67 @@
+import random
+import string
+
+# Same headings extract_detailed_info looks for
+SECTION_HEADINGS = ("Summary", "Skills", "Experience", "Education")
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "SQL", "MySQL", "PostgreSQL", "React", "Django", "Flask",
+    "Docker", "Kubernetes", "Linux", "Git", "AWS", "Excel", "Tableau", "Accounting", "Marketing", "Sales",
+    "Leadership", "Communication", "Negotiation", "Photoshop", "Figma", "Recruitment", "Payroll", "Logistics",
+    "Customer Service", "Project Management", "Machine Learning", "Data Analysis", "Networking", "Scrum",
+]
+ROLES = [
+    "Software Engineer", "Data Analyst", "HR Officer", "Accountant", "Marketing Intern", "Sales Executive",
+    "Graphic Designer", "Project Manager", "System Administrator", "Business Analyst", "Chef", "Teacher",
+]
+SCHOOLS = ["Institut Teknologi Bandung", "Universitas Indonesia", "Universitas Gadjah Mada", "Universitas Padjadjaran", "Binus University"]
+FILLER = (
+    "responsible for managing daily operations and coordinating with cross functional teams to deliver "
+    "projects on time while improving processes reporting quality and customer satisfaction across the "
+    "company using modern tools and strong analytical problem solving skills in a fast paced environment"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(FILLER) for _ in range(words)).capitalize() + "."
+
+def generate_cv_text(rng: random.Random, words_per_section: int = 60) -> str:
+    """
+    One CV-like text with the Summary/Skills/Experience/Education sections.
+    """
+    role = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    lines = [f"{role.upper()}", "Summary", _sentence(rng, words_per_section)]
+    lines += ["Skills", ", ".join(skills)]
+    lines.append("Experience")
+    for _ in range(rng.randint(1, 3)):
+        start = rng.randint(2010, 2022)
+        lines.append(f"{rng.choice(ROLES)} {start} - {start + rng.randint(1, 3)}")
+        lines.append(f"{_sentence(rng, words_per_section // 2)} Used {', '.join(rng.sample(skills, min(3, len(skills))))}.")
+    lines += ["Education", f"Bachelor {rng.randint(2005, 2020)} {rng.choice(SCHOOLS)}"]
+    return "\n".join(lines)
+
+def generate_corpus(size: int, words_per_section: int = 60, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [generate_cv_text(rng, words_per_section) for _ in range(size)]
+
+def generate_keywords(count: int, length: int, seed: int = 0) -> list[str]:
+    """
+    count keywords of about length chars, a mix of substrings of corpus words
+    (exact hits), the same with one typo (fuzzy hits) and random strings (misses).
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted({word for word in " ".join(SKILLS + FILLER).split() if len(word) >= length})
+    keywords = []
+    for i in range(count):
+        if i % 3 == 2 or not vocabulary:
+            keywords.append("".join(rng.choices(string.ascii_lowercase, k=length)))
+            continue
+        word = rng.choice(vocabulary)
+        start = rng.randint(0, len(word) - length)
+        keyword = word[start:start + length]
+        if i % 3 == 1:
+            typo = rng.randrange(length)
+            keyword = keyword[:typo] + rng.choice(string.ascii_lowercase) + keyword[typo + 1:]
+        keywords.append(keyword)
+    return keywords
@@ -0,0 +1,92 @@
+import contextlib
+import os
+import random
+from unittest import mock
+from faker import Faker
+
+import database.db as db
+import encryption.encryption as ENC
+import interface
+from algorithms.InvertedIndex import InvertedIndex
+from database.cache import TextCache
+
+class _NullConnection():
+    def cursor(self):
+        return self
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+class InMemoryDatabase():
+    """
+    Local stand-in for the database.db read/write helpers, holding the same
+    encrypted rows the MySQL tables would. install() swaps it in, so the real
+    iter_search_data, decryption and search code run unchanged.
+    """
+    def __init__(self):
+        self.rows : list[db.ApplicantRow] = []
+        self.cv_text : dict[int, bytes] = {}  # detail_id -> compressed text, like CVText
+        self.index : InvertedIndex = InvertedIndex()
+
+    def add_applicants(self, cv_paths: list[str], seed: int = 0, store_text: bool = False) -> None:
+        """
+        Adds one encrypted applicant per CV, like ingest. Without store_text the
+        CVText rows are left empty, like seeded data, so the first search extracts the PDFs.
+        """
+        fake = Faker("id_ID")
+        fake.seed_instance(seed)
+        rng = random.Random(seed)
+        keys = [os.urandom(32) for _ in cv_paths]
+        for i, (cv_path, key, ((C1_x, C1_y), cipherkey)) in enumerate(zip(cv_paths, keys, ENC.encrypt_ecc_batch(keys))):
+            applicant_id = detail_id = len(self.rows) + 1
+            first_name, last_name, date_of_birth, address, phone_number = ENC.encrypt_spn_many([
+                fake.first_name(),
+                fake.last_name(),
+                fake.date_of_birth(minimum_age=18, maximum_age=60).strftime("%Y-%m-%d"),
+                fake.address().replace('\n', ', '),
+                '628' + ''.join(rng.choices('0123456789', k=10)),
+            ], key)
+            self.rows.append(db.ApplicantRow(
+                applicant_id, first_name, last_name, date_of_birth, address, phone_number,
+                detail_id, cv_path, C1_x.to_bytes(32, "big"), C1_y.to_bytes(32, "big"), cipherkey, None
+            ))
+            if store_text:
+                self.store_cv_text(None, detail_id, db.extract_text_from_pdf(cv_path, use_cache=False))
+
+    def iter_applicant_rows(self, applicant_id: int = None, include_text: bool = True, limit: int = None, batch_size: int = 1000):
+        count = 0
+        for row in self.rows:
+            if applicant_id is not None and row.applicant_id != applicant_id:
+                continue
+            if limit is not None and count >= limit:
+                return
+            count += 1
+            row.cv_text = self.cv_text.get(row.detail_id) if include_text else None
+            yield row
+
+    def store_cv_text(self, cursor, detail_id: int, text: str) -> None:
+        self.cv_text[detail_id] = db.compress_text(text)
+        self.index.add_document(detail_id, text)
+
+    def get_token_index(self) -> InvertedIndex:
+        return self.index
+
+    @contextlib.contextmanager
+    def install(self, cache_dir: str):
+        """
+        Routes database.db and interface to this stand-in, with a fresh text cache in cache_dir.
+        """
+        with contextlib.ExitStack() as stack:
+            for module in (db, interface):
+                stack.enter_context(mock.patch.object(module, "get_token_index", self.get_token_index))
+                stack.enter_context(mock.patch.object(module, "get_cv_count", lambda: len(self.rows)))
+            stack.enter_context(mock.patch.object(db, "iter_applicant_rows", self.iter_applicant_rows))
+            stack.enter_context(mock.patch.object(db, "store_cv_text", self.store_cv_text))
+            stack.enter_context(mock.patch.object(db, "get_connection", lambda *args, **kwargs: _NullConnection()))
+            stack.enter_context(mock.patch.object(db, "TEXT_CACHE", TextCache(cache_dir)))
+            db.APPLICANT_CACHE.clear()
+            yield self
+            db.APPLICANT_CACHE.clear()
@@ -0,0 +1,46 @@
+import os
+import random
+import fitz
+from faker import Faker
+from benchmarks.corpus import generate_cv_text
+
+LINES_PER_PAGE : int = 55
+
+def write_cv_pdf(path: str, lines: list[str]) -> None:
+    """
+    Writes lines as a plain one-column PDF, starting a new page every LINES_PER_PAGE lines.
+    """
+    doc = fitz.open()
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        page = doc.new_page()
+        page.insert_text((50, 60), "\n".join(lines[start:start + LINES_PER_PAGE]), fontsize=10)
+    doc.save(path)
+    doc.close()
+
+def generate_pdf_corpus(directory: str, count: int, seed: int = 0, words_per_section: int = 60) -> list[str]:
+    """
+    Makes sure directory holds count synthetic CV PDFs and returns their paths.
+    Files are named by index and seed, so an existing corpus is reused and only
+    the missing files are written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fake = Faker("id_ID")
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"cv_{seed}_{i:06d}.pdf")
+        paths.append(path)
+        if os.path.exists(path):
+            continue
+        rng = random.Random(f"{seed}-{i}")
+        fake.seed_instance(rng.random())
+        lines = [fake.name(), fake.address().replace("\n", ", "), fake.phone_number(), ""]
+        for line in generate_cv_text(rng, words_per_section).split("\n"):
+            # wrap long paragraphs so they stay on the page
+            while len(line) > 95:
+                cut = line.rfind(" ", 0, 95)
+                cut = cut if cut > 0 else 95
+                lines.append(line[:cut])
+                line = line[cut:].lstrip()
+            lines.append(line)
+        write_cv_pdf(path, lines)
+    return paths
@@ -0,0 +1,64 @@
+import datetime
+import json
+import platform
+import sys
+
+def percentiles(samples: list[float], points: tuple[int, ...] = (50, 90, 99)) -> dict[str, float]:
+    """
+    Nearest-rank percentiles of samples, keyed "p50", "p90", ...
+    """
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        rank = max(0, min(len(ordered) - 1, -(-point * len(ordered) // 100) - 1))
+        result[f"p{point}"] = ordered[rank] if ordered else 0.0
+    return result
+
+def make_report(name: str, params: dict, results: dict) -> dict:
+    return {
+        "benchmark": name,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "results": results,
+    }
+
+def write_report(report: dict, path: str | None) -> None:
+    """
+    Writes the report as sorted, indented JSON so two runs diff cleanly. None writes to stdout.
+    """
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path is None:
+        print(text)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+
+def load_report(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compare_reports(baseline: dict, current: dict, metric: str, higher_is_better: bool, tolerance: float = 0.10, min_delta: float = 0.0) -> list[str]:
+    """
+    Prints metric for every result present in both reports and returns the
+    names that got worse than baseline by more than tolerance (a fraction)
+    and by more than min_delta in absolute terms, which keeps tiny timings
+    from flagging on noise.
+    """
+    if baseline.get("params") != current.get("params"):
+        print("Warning: baseline was recorded with different params", file=sys.stderr)
+
+    regressions = []
+    for name, result in sorted(current["results"].items()):
+        old = baseline["results"].get(name, {}).get(metric)
+        new = result.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > tolerance and abs(new - old) > min_delta else ""
+        print(f"{name:>24} {metric}: {old:12.4f} -> {new:12.4f} ({change:+.1%}) {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+class TextCache():
+    """
+    Disk-backed cache of text extracted from CV PDFs.
+
+    Entries are keyed by cv_path and validated against the file's size and
+    mtime, so an edited or replaced PDF is re-extracted automatically.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, file_path: str) -> str:
+        digest : str = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + ".json")
+
+    @staticmethod
+    def _fingerprint(file_path: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, file_path: str) -> str | None:
+        """
+        Returns the cached text of file_path, or None if missing or stale.
+        """
+        fingerprint = self._fingerprint(file_path)
+        if fingerprint is None:
+            return None
+        try:
+            with open(self._entry_path(file_path), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("path") != file_path or (entry.get("size"), entry.get("mtime")) != fingerprint:
+            return None
+        return entry.get("text")
+
+    def put(self, file_path: str, text: str) -> None:
+        fingerprint = self._fingerprint(file_path)
+        if fingerprint is None:
+            return
+        entry_path : str = self._entry_path(file_path)
+        entry = {"path": file_path, "size": fingerprint[0], "mtime": fingerprint[1], "text": text}
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            # write to a temp file first so a crash never leaves a half-written entry,
+            # one per process since ingestion workers may share the cache
+            temp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            print(f"Error writing text cache for {file_path}: {e}")
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+class ApplicantCache():
+    """
+    Thread-safe in-memory LRU cache of values derived from an applicant, such
+    as the decrypted SPN key and display name. Keys should identify the
+    applicant's data, not only its id, since ids are reused after a reset.
+
+    Holds at most max_size entries. With a ttl (seconds) entries expire and
+    are recomputed on the next lookup.
+    """
+    def __init__(self, max_size: int = 50000, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries : OrderedDict = OrderedDict()  # key -> (stored at, value)
+        self._lock = threading.Lock()
+        self.hits : int = 0
+        self.misses : int = 0
+
+    def get(self, key):
+        """
+        Returns the cached value for key, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TextCache(os.path.join(self.tmp.name, "cache"))
+        self.pdf = os.path.join(self.tmp.name, "cv.pdf")
+        self.write(b"%PDF-1.4 first")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data: bytes) -> None:
+        with open(self.pdf, "wb") as f:
+            f.write(data)
+
+    def test_round_trip(self):
+        """Test that a stored text is returned for an unchanged file."""
+        self.assertIsNone(self.cache.get(self.pdf))
+        self.cache.put(self.pdf, "Python, SQL")
+        self.assertEqual(self.cache.get(self.pdf), "Python, SQL")
+        self.assertEqual(TextCache(self.cache.cache_dir).get(self.pdf), "Python, SQL")
+
+    def test_size_change_invalidates(self):
+        """Test that rewriting the file with other content drops the entry."""
+        self.cache.put(self.pdf, "first")
+        mtime = os.stat(self.pdf).st_mtime_ns
+        self.write(b"%PDF-1.4 second version")
+        os.utime(self.pdf, ns=(mtime, mtime))
+        self.assertIsNone(self.cache.get(self.pdf))
+
+    def test_mtime_change_invalidates(self):
+        """Test that touching the file drops the entry even with the same size."""
+        self.cache.put(self.pdf, "first")
+        mtime = os.stat(self.pdf).st_mtime_ns
+        os.utime(self.pdf, ns=(mtime + 10**9, mtime + 10**9))
+        self.assertIsNone(self.cache.get(self.pdf))
+        self.cache.put(self.pdf, "touched")
+        self.assertEqual(self.cache.get(self.pdf), "touched")
+
+    def test_missing_file(self):
+        """Test that missing files are neither stored nor returned."""
+        self.cache.put(self.pdf, "first")
+        os.remove(self.pdf)
+        self.assertIsNone(self.cache.get(self.pdf))
+        missing = os.path.join(self.tmp.name, "missing.pdf")
+        self.cache.put(missing, "text")
+        self.assertIsNone(self.cache.get(missing))
+
+    def test_corrupt_entry(self):
+        """Test that an unreadable entry counts as a miss."""
+        self.cache.put(self.pdf, "first")
+        with open(self.cache._entry_path(self.pdf), "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertIsNone(self.cache.get(self.pdf))
+
+    def test_clear(self):
+        """Test that clear removes every entry."""
+        self.cache.put(self.pdf, "first")
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache.cache_dir))
+        self.assertIsNone(self.cache.get(self.pdf))
+        self.cache.clear()
+
+
+class TestApplicantCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is dropped at max_size."""
+        cache = ApplicantCache(max_size=3)
+        for key in "abc":
+            cache.put(key, key.upper())
+        self.assertEqual(cache.get("a"), "A")   # a is now the most recent
+        cache.put("d", "D")
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual([cache.get(key) for key in "acd"], ["A", "C", "D"])
+
+    def test_put_refreshes(self):
+        """Test that overwriting a key replaces its value and keeps it alive."""
+        cache = ApplicantCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 3)
+        cache.put("c", 4)
+        self.assertEqual(cache.get("a"), 3)
+        self.assertIsNone(cache.get("b"))
+
+    def test_ttl_expiry(self):
+        """Test that entries older than the ttl are recomputed."""
+        cache = ApplicantCache(ttl=10)
+        with mock.patch.object(time, "monotonic", return_value=100.0):
+            cache.put((1, "x"), "Siti")
+        with mock.patch.object(time, "monotonic", return_value=110.0):
+            self.assertEqual(cache.get((1, "x")), "Siti")
+        with mock.patch.object(time, "monotonic", return_value=110.5):
+            self.assertIsNone(cache.get((1, "x")))
+        self.assertEqual(len(cache), 0)
+
+    def test_no_ttl(self):
+        """Test that entries never expire without a ttl."""
+        cache = ApplicantCache()
+        cache.put(1, "Budi")
+        with mock.patch.object(time, "monotonic", return_value=time.monotonic() + 10**9):
+            self.assertEqual(cache.get(1), "Budi")
+
+    def test_invalidate_and_clear(self):
+        """Test that invalidate drops one key and clear drops all of them."""
+        cache = ApplicantCache()
+        cache.put((1, "x"), "Siti")
+        cache.put((1, "y"), "Budi")
+        cache.invalidate((1, "x"))
+        cache.invalidate((9, "z"))
+        self.assertIsNone(cache.get((1, "x")))
+        self.assertEqual(cache.get((1, "y")), "Budi")
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get((1, "y")))
+
+    def test_hit_and_miss_counts(self):
+        """Test the hit and miss counters."""
+        cache = ApplicantCache()
+        cache.get(1)
+        cache.put(1, "Siti")
+        cache.get(1)
+        cache.get(1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
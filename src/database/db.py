@@ -5,9 +5,17 @@ import re
 import os
 from faker import Faker
 import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import encryption.encryption as ENC
+from database.cache import TextCache, ApplicantCache
+import database.sqlite_backend as sqlite_backend
+from algorithms.InvertedIndex import InvertedIndex
 
+import threading
+import sqlite3
 import mysql.connector
+from mysql.connector import pooling
 import dotenv
 
 class SummaryData():
@@ -22,13 +30,19 @@ class SummaryData():
         self.summary = summary
 # ------------------------------ EXTRACT TEXT FROM PDF ------------------------------
 
-def extract_text_from_pdf(file_path: str) -> str:
+def extract_text_from_pdf(file_path: str, use_cache: bool = True) -> str:
     """
     Mengekstrak teks dari file PDF menjadi satu string panjang menggunakan PyMuPDF.
+    Hasil ekstraksi disimpan di TEXT_CACHE sehingga PDF yang sama tidak di-parse ulang.
     
     :param file_path: Path ke file PDF
+    :param use_cache: Cek dan isi cache teks sebelum membuka PDF
     :return: Teks hasil ekstraksi
     """
+    if use_cache:
+        cached = TEXT_CACHE.get(file_path)
+        if cached is not None:
+            return cached
     try :
         full_text = []
 
@@ -38,7 +52,10 @@ def extract_text_from_pdf(file_path: str) -> str:
                 if text:
                     full_text.append(text)
 
-        return "\n".join(full_text)
+        text = "\n".join(full_text)
+        if use_cache:
+            TEXT_CACHE.put(file_path, text)
+        return text
     except Exception as e:
         print(f"Error extracting text from {file_path}: {e}")
         return ""
@@ -120,6 +137,12 @@ def extract_summary_data_from_pdf(file_path: str) -> SummaryData:
     summary_data = extract_detailed_info(extracted_text)
     return summary_data
 
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"))
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
 
 # ==================================== PDF TO MYSQL ====================================
 dotenv.load_dotenv()  # Load environment variables from .env file
@@ -127,50 +150,193 @@ DB_HOST = os.getenv("DB_HOST")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD") 
 DB_NAME = os.getenv("DB_NAME")
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql")  # "mysql" atau "sqlite" untuk deployment satu mesin
+SQLITE_PATH = os.getenv("SQLITE_PATH", "src/database/hr_magang.sqlite3")
+TEXT_CACHE = TextCache(os.getenv("CV_TEXT_CACHE_DIR", ".cache/cv_text"))
+# applicant_id -> (SPN key, nama) hasil dekripsi, agar ECC tidak dihitung ulang setiap pencarian
+APPLICANT_CACHE = ApplicantCache(
+    int(os.getenv("APPLICANT_CACHE_SIZE", "50000")),
+    float(os.getenv("APPLICANT_CACHE_TTL")) if os.getenv("APPLICANT_CACHE_TTL") else None
+)
+_token_index: InvertedIndex = None  # dimuat lazily oleh get_token_index()
+_token_index_generation : int = None  # IndexGeneration.generation saat _token_index dimuat
+_token_index_max_id : int = 0         # detail_id terbesar yang sudah dibaca dari TokenIndex
+_load_lock = threading.Lock()  # satu iter_search_data per proses, supaya backfill tidak dobel
+INGEST_WORKERS : int = int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+INGEST_BATCH_SIZE : int = 100
+INGEST_MAX_PENDING_PER_WORKER : int = 2
+
+DB_POOL_SIZE : int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT : float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+_pool : pooling.MySQLConnectionPool = None
+_pool_slots : threading.BoundedSemaphore = None  # membuat checkout menunggu, bukan PoolError, saat pool habis
+_pool_lock = threading.Lock()
+_pool_stats = {"checkouts": 0, "in_use": 0, "waits": 0, "timeouts": 0}
+
+class PooledConnection():
+    """
+    Koneksi pinjaman dari pool. close() mengembalikan koneksi ke pool, bukan memutusnya.
+    """
+    def __init__(self, conn):
+        self._conn = conn
 
-def get_connection():
-    try :
-        temp_conn = mysql.connector.connect(
-            host= DB_HOST,
-            user = DB_USER,
-            password = DB_PASSWORD,
-        )
-        temp_cursor = temp_conn.cursor()
-        temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
-        temp_conn.commit()
-        temp_cursor.close()
-        temp_conn.close()
-
-        return mysql.connector.connect(
-            host= DB_HOST,
-            user = DB_USER,
-            password = DB_PASSWORD,
-            database=DB_NAME
-        )
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            conn.close()
+        finally:
+            with _pool_lock:
+                _pool_stats["in_use"] -= 1
+            _pool_slots.release()
+
+def configure_backend(backend: str, sqlite_path: str = None):
+    """
+    Memilih backend ("mysql" atau "sqlite") saat runtime. Pool yang ada dibuang,
+    dan init_database() berikutnya membuat pool untuk backend baru.
+    """
+    global DB_BACKEND, SQLITE_PATH, _pool, _pool_slots, _token_index
+    if backend not in ("mysql", "sqlite"):
+        raise ValueError(f"Unknown database backend: {backend}")
+    with _pool_lock:
+        DB_BACKEND = backend
+        if sqlite_path is not None:
+            SQLITE_PATH = sqlite_path
+        _pool = None
+        _pool_slots = None
+    _token_index = None
+    APPLICANT_CACHE.clear()
+
+def init_database() -> bool:
+    """
+    Bootstrap sekali per proses: membuat database bila belum ada, membuat pool koneksi,
+    lalu memastikan semua tabel ada. Aman dipanggil berulang kali.
+    """
+    global _pool, _pool_slots
+    with _pool_lock:
+        if _pool is not None:
+            return True
+        if DB_BACKEND == "sqlite":
+            # SQLite embedded: tidak ada server, file database dibuat saat koneksi pertama
+            try:
+                _pool = sqlite_backend.SQLitePool(SQLITE_PATH, DB_POOL_TIMEOUT)
+            except (sqlite3.Error, OSError) as err:
+                print(f"Error: {err}")
+                return False
+            _pool_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
+        else:
+            try:
+                temp_conn = mysql.connector.connect(
+                    host= DB_HOST,
+                    user = DB_USER,
+                    password = DB_PASSWORD,
+                )
+                temp_cursor = temp_conn.cursor()
+                temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
+                temp_conn.commit()
+                temp_cursor.close()
+                temp_conn.close()
+
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="cv_pool",
+                    pool_size=DB_POOL_SIZE,
+                    host= DB_HOST,
+                    user = DB_USER,
+                    password = DB_PASSWORD,
+                    database=DB_NAME
+                )
+                _pool_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
+            except mysql.connector.Error as err:
+                print(f"Error: {err}")
+                return False
+    create_tables_if_not_exist()
+    return True
+
+def get_connection(timeout: float = DB_POOL_TIMEOUT):
+    """
+    Meminjam koneksi dari pool, menunggu paling lama timeout detik jika semua sedang dipakai.
+    Thread-safe. Kembalikan ke pool dengan conn.close().
+    """
+    if _pool is None and not init_database():
+        return None
+
+    if not _pool_slots.acquire(blocking=False):
+        with _pool_lock:
+            _pool_stats["waits"] += 1
+        if not _pool_slots.acquire(timeout=timeout):
+            with _pool_lock:
+                _pool_stats["timeouts"] += 1
+            print(f"Error: tidak ada koneksi database yang bebas setelah {timeout} detik")
+            return None
+
+    try:
+        conn = _pool.get_connection()
     except mysql.connector.Error as err:
+        _pool_slots.release()
         print(f"Error: {err}")
         return None
+    with _pool_lock:
+        _pool_stats["checkouts"] += 1
+        _pool_stats["in_use"] += 1
+    return PooledConnection(conn)
+
+def get_pool_stats() -> dict:
+    """
+    Statistik pool: ukuran, koneksi yang sedang dipakai, jumlah checkout, berapa kali harus menunggu dan timeout.
+    """
+    with _pool_lock:
+        stats = dict(_pool_stats)
+    stats["size"] = DB_POOL_SIZE if _pool is not None else 0
+    return stats
 
 def reset_tables():
     conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute("DELETE FROM EncryptionParameters")
+    cursor.execute("DELETE FROM TokenIndex")
+    cursor.execute("DELETE FROM CVText")
     cursor.execute("DELETE FROM ApplicationDetail")
     cursor.execute("DELETE FROM ApplicantProfile")
 
-    cursor.execute("ALTER TABLE ApplicationDetail AUTO_INCREMENT = 1")
-    cursor.execute("ALTER TABLE ApplicantProfile AUTO_INCREMENT = 1")
+    if DB_BACKEND == "sqlite":
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name IN ('ApplicationDetail', 'ApplicantProfile')")
+    else:
+        cursor.execute("ALTER TABLE ApplicationDetail AUTO_INCREMENT = 1")
+        cursor.execute("ALTER TABLE ApplicantProfile AUTO_INCREMENT = 1")
+    bump_index_generation(cursor)
 
     conn.commit()
     cursor.close()
     conn.close()
+    TEXT_CACHE.clear()
+    APPLICANT_CACHE.clear()  # applicant_id akan dipakai ulang setelah AUTO_INCREMENT direset
+    if _token_index is not None:
+        _token_index.clear()
     print("Semua data dalam tabel telah dihapus.")
 
 
 def create_tables_if_not_exist():
     conn = get_connection()
     cursor = conn.cursor()
+    if DB_BACKEND == "sqlite":
+        for statement in sqlite_backend.SCHEMA:
+            cursor.execute(statement)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        print("Tabel sudah dipastikan ada di database.")
+        return
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS ApplicantProfile (
             applicant_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -181,6 +347,15 @@ def create_tables_if_not_exist():
             phone_number VARCHAR(20) DEFAULT NULL
         )
     ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS EncryptionParameters (
+            applicant_id INT NOT NULL,
+            C1_x TINYBLOB,
+            C1_y TINYBLOB,
+            SPN_key TINYBLOB,
+            FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+        )
+    ''')
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS ApplicationDetail (
             detail_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -190,190 +365,483 @@ def create_tables_if_not_exist():
             FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
         )
     ''')
+    # Teks CV disimpan terkompresi (zlib) per ApplicationDetail saat ingest
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS CVText (
+            detail_id INT PRIMARY KEY,
+            cv_text LONGBLOB NOT NULL,
+            FOREIGN KEY (detail_id) REFERENCES ApplicationDetail(detail_id)
+        )
+    ''')
+    # Inverted index token -> CV untuk memangkas kandidat sebelum exact matching
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS TokenIndex (
+            token VARCHAR(255) COLLATE utf8mb4_bin NOT NULL,
+            detail_id INT NOT NULL,
+            term_frequency INT NOT NULL,
+            PRIMARY KEY (token, detail_id),
+            INDEX (detail_id),
+            FOREIGN KEY (detail_id) REFERENCES ApplicationDetail(detail_id)
+        ) DEFAULT CHARSET=utf8mb4
+    ''')
+    # Naik setiap kali detail_id bisa dipakai ulang (reset/seeding), agar host lain memuat ulang index
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS IndexGeneration (
+            id INT PRIMARY KEY,
+            generation INT NOT NULL
+        )
+    ''')
+    cursor.execute("INSERT IGNORE INTO IndexGeneration (id, generation) VALUES (1, 0)")
     conn.commit()
     cursor.close()
     conn.close()
     print("Tabel sudah dipastikan ada di database.")
 
-def insert_pdf_to_mysql(file_path: str, application_role: str = None):
-    fake = Faker("id_ID") 
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if file_path.lower().endswith('.pdf'):
-        print(f"Memproses file: {file_path} ==================================")
+def store_cv_text(cursor, detail_id: int, text: str):
+    """
+    Menyimpan teks CV terkompresi untuk satu ApplicationDetail.
+    """
+    if DB_BACKEND == "sqlite":
+        upsert = "ON CONFLICT(detail_id) DO UPDATE SET cv_text = excluded.cv_text"
+    else:
+        upsert = "ON DUPLICATE KEY UPDATE cv_text = VALUES(cv_text)"
+    cursor.execute(
+        f"""
+        INSERT INTO CVText (detail_id, cv_text)
+        VALUES (%s, %s)
+        {upsert}
+        """,
+        (detail_id, compress_text(text))
+    )
+    store_token_index(cursor, detail_id, text)
 
-        spnkey = os.urandom(32)
+def store_token_index(cursor, detail_id: int, text: str):
+    """
+    Menulis token CV ke TokenIndex dan memperbarui inverted index di memori.
+    """
+    if _token_index is not None:
+        counts = _token_index.add_document(detail_id, text)
+    else:
+        counts = InvertedIndex.tokenize(text)
+    cursor.execute("DELETE FROM TokenIndex WHERE detail_id = %s", (detail_id,))
+    cursor.executemany(
+        """
+        INSERT INTO TokenIndex (token, detail_id, term_frequency)
+        VALUES (%s, %s, %s)
+        """,
+        [(token, detail_id, frequency) for token, frequency in counts.items()]
+    )
 
-        first_name = ENC.encrypt_spn(fake.first_name(), spnkey)
-        last_name = ENC.encrypt_spn(fake.last_name(), spnkey)
-        address = ENC.encrypt_spn(fake.address().replace('\n', ', '), spnkey)
-        phone_number = ENC.encrypt_spn('628' + ''.join(random.choices('0123456789', k=10)), spnkey)
-        date_of_birth = ENC.encrypt_spn(fake.date_of_birth(minimum_age=18, maximum_age=60).strftime("%Y-%m-%d"), spnkey)
-        email = f"{last_name.lower()}.{first_name}@StimeHehe.com"
+def bump_index_generation(cursor):
+    """
+    Menandai bahwa detail_id lama bisa dipakai ulang, sehingga setiap proses memuat ulang index-nya.
+    """
+    cursor.execute("UPDATE IndexGeneration SET generation = generation + 1 WHERE id = 1")
 
+def get_token_index() -> InvertedIndex:
+    """
+    Mengembalikan inverted index CV dari TokenIndex. Dicek ulang di setiap pencarian:
+    dimuat ulang penuh jika IndexGeneration berubah (reset di host lain), dan baris
+    dengan detail_id yang lebih baru (upload di host lain) ditambahkan.
+    """
+    global _token_index, _token_index_generation, _token_index_max_id
+    with _load_lock:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT generation FROM IndexGeneration WHERE id = 1")
+        rows = cursor.fetchall()
+        generation = rows[0][0] if rows else None
+        cursor.execute("SELECT MAX(detail_id) FROM TokenIndex")
+        max_id = cursor.fetchall()[0][0] or 0
+
+        if _token_index is None or generation != _token_index_generation:
+            index = InvertedIndex()
+            after = 0
+        elif max_id > _token_index_max_id:
+            index = _token_index
+            after = _token_index_max_id
+        else:
+            cursor.close()
+            conn.close()
+            return _token_index
+
+        with index.lock:
+            known = set(index.documents)  # sudah ditambahkan oleh upload di proses ini
+        cursor.execute("SELECT token, detail_id, term_frequency FROM TokenIndex WHERE detail_id > %s", (after,))
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            for token, detail_id, frequency in rows:
+                if detail_id not in known:
+                    index.add_posting(token, detail_id, frequency)
+        cursor.close()
+        conn.close()
+
+        _token_index = index
+        _token_index_generation = generation
+        _token_index_max_id = max(max_id, after)
+        return _token_index
+
+class CVRecord():
+    """
+    Hasil tahap CPU-bound ingest satu PDF, siap ditulis ke database.
+    """
+    def __init__(self, file_path: str, application_role: str, profile: tuple, encryption: tuple, cv_text: bytes, tokens: dict):
+        self.file_path = file_path
+        self.application_role = application_role
+        self.profile = profile          # (first_name, last_name, date_of_birth, address, phone_number) terenkripsi
+        self.encryption = encryption    # (C1_x, C1_y, SPN_key)
+        self.cv_text = cv_text          # teks terkompresi, None jika PDF tidak menghasilkan teks
+        self.tokens = tokens            # token -> term frequency
+
+_faker : Faker = None  # satu instance per proses, pembuatannya mahal
+_faker_pid : int = None
+
+def prepare_cv_record(file_path: str, application_role: str = None) -> CVRecord:
+    """
+    Membuat identitas palsu, mengenkripsi data applicant, serta mengekstrak dan
+    mentokenisasi teks PDF. Tidak menyentuh database, aman dijalankan di worker process.
+    """
+    global _faker, _faker_pid
+    if _faker is None or _faker_pid != os.getpid():
+        # RNG bawaan faker ikut tersalin saat fork, tanpa seed sendiri setiap worker
+        # menghasilkan identitas yang sama persis
+        _faker = Faker("id_ID")
+        _faker.seed_instance(int.from_bytes(os.urandom(8), "big"))
+        _faker_pid = os.getpid()
+    fake = _faker
+
+    spnkey = os.urandom(32)
+    profile = tuple(ENC.encrypt_spn_many([
+        fake.first_name(),
+        fake.last_name(),
+        fake.date_of_birth(minimum_age=18, maximum_age=60).strftime("%Y-%m-%d"),
+        fake.address().replace('\n', ', '),
+        '628' + ''.join(random.choices('0123456789', k=10)),
+    ], spnkey))
+    (C1_x, C1_y), SPN_key = ENC.encrypt_ecc(spnkey)
+
+    text = extract_text_from_pdf(file_path)
+    return CVRecord(
+        file_path,
+        application_role,
+        profile,
+        (C1_x.to_bytes(32, "big"), C1_y.to_bytes(32, "big"), SPN_key),
+        compress_text(text) if text else None,
+        InvertedIndex.tokenize(text),
+    )
+
+def write_cv_records(cursor, records: List[CVRecord]):
+    """
+    Menulis satu batch CVRecord. ApplicantProfile dan ApplicationDetail di-insert
+    per baris karena butuh lastrowid, tabel lainnya dengan satu executemany per batch.
+    """
+    encryption_rows = []
+    text_rows = []
+    token_rows = []
+    for record in records:
         cursor.execute(
             """
             INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number)
             VALUES (%s, %s, %s, %s, %s)
             """,
-            (first_name, last_name, date_of_birth, address, phone_number)
+            record.profile
         )
-
         applicant_id = cursor.lastrowid  # Dapatkan ID hasil insert barusan
-        (C1_x, C1_y), SPN_key = ENC.encrypt_ecc(spnkey)
         cursor.execute(
             """
-            INSERT INTO EncryptionParameters (applicant_id, C1_x, C1_y, SPN_key) 
-            VALUES (%s, %s, %s, %s)
+            INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path)
+            VALUES (%s, %s, %s)
             """,
-            (applicant_id, C1_x.to_bytes(32, "big"), C1_y.to_bytes(32, "big"), SPN_key)
+            (applicant_id, record.application_role, record.file_path)
         )
-
-        cursor.execute(
+        detail_id = cursor.lastrowid
+
+        encryption_rows.append((applicant_id,) + record.encryption)
+        if record.cv_text is None:
+            continue  # biarkan iter_search_data mencoba ekstraksi lagi
+        text_rows.append((detail_id, record.cv_text))
+        token_rows.extend((token, detail_id, frequency) for token, frequency in record.tokens.items())
+        if _token_index is not None:
+            _token_index.add_counts(detail_id, record.tokens)
+
+    cursor.executemany(
+        """
+        INSERT INTO EncryptionParameters (applicant_id, C1_x, C1_y, SPN_key) 
+        VALUES (%s, %s, %s, %s)
+        """,
+        encryption_rows
+    )
+    if text_rows:
+        cursor.executemany("INSERT INTO CVText (detail_id, cv_text) VALUES (%s, %s)", text_rows)
+    if token_rows:
+        cursor.executemany(
             """
-            INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path)
+            INSERT INTO TokenIndex (token, detail_id, term_frequency)
             VALUES (%s, %s, %s)
             """,
-            (applicant_id, application_role, file_path)
+            token_rows
         )
+
+def iter_cv_records(file_paths: List[str], application_role: str = None, workers: int = 1):
+    """
+    Menghasilkan CVRecord untuk setiap file, diproses paralel bila workers > 1.
+    Paling banyak INGEST_MAX_PENDING_PER_WORKER * workers file diproses bersamaan,
+    sehingga memori tetap terbatas walaupun penulis database lebih lambat.
+    """
+    if workers <= 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            print(f"Memproses file: {file_path} ==================================")
+            yield prepare_cv_record(file_path, application_role)
+        return
+
+    paths = iter(file_paths)
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            while True:
+                while len(pending) < workers * INGEST_MAX_PENDING_PER_WORKER:
+                    file_path = next(paths, None)
+                    if file_path is None:
+                        break
+                    print(f"Memproses file: {file_path} ==================================")
+                    pending.add(pool.submit(prepare_cv_record, file_path, application_role))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+def insert_pdf_to_mysql(file_path: str, application_role: str = None):
+    if not file_path.lower().endswith('.pdf'):
+        return
+    conn = get_connection()
+    cursor = conn.cursor()
+    print(f"Memproses file: {file_path} ==================================")
+    write_cv_records(cursor, [prepare_cv_record(file_path, application_role)])
     conn.commit()
     cursor.close()
     conn.close()
 
-def insert_folder_pdfs_to_mysql(folder_path: str, application_role: str = None):
-    fake = Faker("id_ID") 
+def insert_folder_pdfs_to_mysql(folder_path: str, application_role: str = None, workers: int = None):
+    """
+    Memasukkan semua PDF di folder ke database. Ekstraksi dan enkripsi berjalan di
+    process pool, sedangkan satu penulis meng-commit hasilnya per INGEST_BATCH_SIZE file.
+    """
+    if workers is None:
+        workers = INGEST_WORKERS
+    file_paths = [
+        os.path.join(folder_path, filename)
+        for filename in os.listdir(folder_path)
+        if filename.lower().endswith('.pdf')
+    ]
+
     conn = get_connection()
     cursor = conn.cursor()
+    batch : List[CVRecord] = []
+    for record in iter_cv_records(file_paths, application_role, workers):
+        batch.append(record)
+        if len(batch) >= INGEST_BATCH_SIZE:
+            write_cv_records(cursor, batch)
+            conn.commit()
+            batch.clear()
+    if batch:
+        write_cv_records(cursor, batch)
+        conn.commit()
 
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith('.pdf'):
-            print(f"Memproses file: {filename} ==================================")
-            file_path = os.path.join(folder_path, filename)
-
-            spnkey = os.urandom(32)
-
-            first_name = ENC.encrypt_spn(fake.first_name(), spnkey)
-            last_name = ENC.encrypt_spn(fake.last_name(), spnkey)
-            address = ENC.encrypt_spn(fake.address().replace('\n', ', '), spnkey)
-            phone_number = ENC.encrypt_spn('628' + ''.join(random.choices('0123456789', k=10)), spnkey)
-            date_of_birth = ENC.encrypt_spn(fake.date_of_birth(minimum_age=18, maximum_age=60).strftime("%Y-%m-%d"), spnkey)
-            email = f"{last_name.lower()}.{first_name}@StimeHehe.com"
-
-            cursor.execute(
-                """
-                INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (first_name, last_name, date_of_birth, address, phone_number)
-            )
-
-            applicant_id = cursor.lastrowid  # Dapatkan ID hasil insert barusan
-            (C1_x, C1_y), SPN_key = ENC.encrypt_ecc(spnkey)
-            cursor.execute(
-                """
-                INSERT INTO EncryptionParameters (applicant_id, C1_x, C1_y, SPN_key) 
-                VALUES (%s, %s, %s, %s)
-                """,
-                (applicant_id, C1_x.to_bytes(32, "big"), C1_y.to_bytes(32, "big"), SPN_key)
-            )
-
-            cursor.execute(
-                """
-                INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path)
-                VALUES (%s, %s, %s)
-                """,
-                (applicant_id, application_role, file_path)
-            )
-
-    conn.commit()
     cursor.close()
     conn.close()
     print(f"Selesai memasukkan semua file PDF dari {folder_path} ke database.")
 
 
-def load_search_data_from_sql() -> list:
-    from interface import SearchData
+class ApplicantRow():
+    """
+    Satu baris hasil iter_applicant_rows: profil terenkripsi, path CV, parameter enkripsi, dan teks CV.
+    """
+    def __init__(self, applicant_id: int, first_name: bytes, last_name: bytes, date_of_birth: bytes, address: bytes, phone_number: bytes,
+                 detail_id: int, cv_path: str, C1_x: bytes, C1_y: bytes, SPN_key: bytes, cv_text: bytes):
+        self.applicant_id = applicant_id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.date_of_birth = date_of_birth
+        self.address = address
+        self.phone_number = phone_number
+        self.detail_id = detail_id
+        self.cv_path = cv_path
+        self.enc_params = (C1_x, C1_y, SPN_key) if SPN_key is not None else None
+        self.cv_text = cv_text  # terkompresi, None jika belum ada di CVText
+        # kunci APPLICANT_CACHE: applicant_id bisa dipakai ulang setelah reset di host lain,
+        # C1_x acak per applicant sehingga id yang dipakai ulang tidak pernah kena cache lama
+        self.cache_key = (applicant_id, C1_x) if SPN_key is not None else (applicant_id, first_name, last_name)
+
+APPLICANT_ROWS_QUERY = '''
+    SELECT ap.applicant_id, ap.first_name, ap.last_name, ap.date_of_birth, ap.address, ap.phone_number,
+           ad.detail_id, ad.cv_path, enc.C1_x, enc.C1_y, enc.SPN_key, {cv_text}
+    FROM ApplicantProfile ap
+    JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
+    LEFT JOIN EncryptionParameters enc ON enc.applicant_id = ap.applicant_id
+    LEFT JOIN CVText ct ON ct.detail_id = ad.detail_id
+'''
+
+def iter_applicant_rows(applicant_id: int = None, include_text: bool = True, limit: int = None, batch_size: int = 1000):
+    """
+    Mengalirkan ApplicantRow (satu per ApplicationDetail, urut detail_id) dengan satu query join
+    yang dibaca per batch_size baris lewat fetchmany. Setiap applicant punya satu baris EncryptionParameters.
+    Koneksi dipegang selama iterasi, jadi jangan menulis ke database di dalam loop.
+    """
+    query = APPLICANT_ROWS_QUERY.format(cv_text="ct.cv_text" if include_text else "NULL")
+    params = ()
+    if applicant_id is not None:
+        query += " WHERE ap.applicant_id = %s"
+        params = (applicant_id,)
+    query += " ORDER BY ad.detail_id"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute('''
-        SELECT DISTINCT ap.applicant_id, ap.first_name, ap.last_name, ad.cv_path
-        FROM ApplicantProfile ap
-        JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
-    ''')
-    result = []
-    rows = cursor.fetchall()
-   
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield ApplicantRow(*row)
+    finally:
+        if conn.unread_result:
+            conn.consume_results()  # iterasi dihentikan lebih awal
+        cursor.close()
+        conn.close()
+
+def decrypt_applicants(rows: List[ApplicantRow]) -> dict:
+    """
+    Mengembalikan {applicant_id: (SPN key, nama lengkap)} untuk semua rows. Yang belum ada di
+    APPLICANT_CACHE didekripsi sekaligus dengan ENC.decrypt_keys_batch.
+    """
+    values = {}
+    pending = {}
     for row in rows:
-        app_id, firstname, lastname, cv_path = row
+        if row.applicant_id in values or row.applicant_id in pending:
+            continue
+        cached = APPLICANT_CACHE.get(row.cache_key)
+        if cached is not None:
+            values[row.applicant_id] = cached
+        elif row.enc_params:
+            pending[row.applicant_id] = row
+        else:
+            values[row.applicant_id] = (None, f"{row.first_name} {row.last_name}")
+            APPLICANT_CACHE.put(row.cache_key, values[row.applicant_id])
+
+    rows = list(pending.values())
+    for row, key in zip(rows, ENC.decrypt_keys_batch([row.enc_params for row in rows])):
+        name = " ".join(ENC.decrypt_spn_many([row.first_name, row.last_name], key))
+        values[row.applicant_id] = (key, name)
+        APPLICANT_CACHE.put(row.cache_key, (key, name))
+    return values
+
+def decrypt_applicant(row: ApplicantRow) -> tuple[bytes, str]:
+    """
+    Mengembalikan (SPN key, nama lengkap) satu applicant.
+    """
+    return decrypt_applicants([row])[row.applicant_id]
 
-        cursor.execute('''
-            SELECT enc.C1_x, enc.C1_y, enc.SPN_key
-            FROM EncryptionParameters enc WHERE enc.applicant_id = %s
-            ''', (app_id,))
+def load_search_data_from_sql(cancelled=None) -> list:
+    """
+    Memuat semua CV untuk pencarian sekaligus. Jika cancelled (callable, opsional)
+    mengembalikan True, hasilnya None. Pencarian memakai iter_search_data agar
+    memori tidak sebanding dengan ukuran korpus.
+    """
+    result = []
+    for batch in iter_search_data(cancelled=cancelled):
+        result.extend(batch)
+    if cancelled is not None and cancelled():
+        return None
+    return result
 
-        enc_params = cursor.fetchall()
-        if enc_params:
-            key = ENC.decrypt_key_from_id(enc_params[0])
-            firstname = ENC.decrypt_spn(firstname, key)
-            lastname = ENC.decrypt_spn(lastname, key)
+def iter_search_data(batch_size: int = 1000, cancelled=None):
+    """
+    Mengalirkan CV untuk pencarian sebagai list SearchData berisi paling banyak batch_size CV,
+    urut detail_id, sehingga yang ada di memori hanya batch yang sedang diproses.
+    cancelled (callable, opsional) dicek per baris; jika mengembalikan True iterasi berhenti.
+    Iterasi dijalankan bergantian: pencarian baru menunggu pencarian yang digantikan berhenti dulu.
+    """
+    cancelled = cancelled or (lambda: False)
+    with _load_lock:
+        rows = []
+        for row in iter_applicant_rows():
+            if cancelled():
+                return
+            rows.append(row)
+            if len(rows) >= batch_size:
+                batch = _load_search_batch(rows, cancelled)
+                if batch is None:
+                    return
+                yield batch
+                rows = []
+        if rows:
+            batch = _load_search_batch(rows, cancelled)
+            if batch is not None:
+                yield batch
+
+def _load_search_batch(rows: List[ApplicantRow], cancelled) -> list:
+    from interface import SearchData
+    result = []
+    missing = []  # (detail_id, text) yang belum punya CVText
 
+    names = decrypt_applicants(rows)  # kunci SPN yang belum di-cache dibuka sekaligus untuk satu batch
+    for row in rows:
+        if row.cv_text is not None:
+            text = decompress_text(row.cv_text)
+        else:
+            # Data lama (mis. hasil seeding) belum punya CVText: ekstrak sekali lalu simpan
+            try:
+                text = extract_text_from_pdf(row.cv_path)
+            except Exception:
+                text = ''
+            if text:
+                missing.append((row.detail_id, text))
+        result.append(SearchData(id=row.applicant_id, name=names[row.applicant_id][1], text=text, detail_id=row.detail_id))
+
+    if missing:
+        # koneksi terpisah: koneksi iter_applicant_rows masih membaca
+        conn = get_connection()
+        cursor = conn.cursor()
         try:
-            text = extract_text_from_pdf(cv_path)
-        except Exception:
-            text = ''
-        result.append(SearchData(id=app_id, name=f"{firstname} {lastname}", text=text))
-    cursor.close()
-    conn.close()
+            for detail_id, text in missing:
+                if cancelled():
+                    return None  # yang sudah ditulis tetap di-commit
+                store_cv_text(cursor, detail_id, text)
+        finally:
+            conn.commit()
+            cursor.close()
+            conn.close()
     return result
 
 def get_cv_path_by_id(applicant_id: int) -> str:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT ad.cv_path 
-        FROM ApplicationDetail ad 
-        WHERE ad.applicant_id = %s LIMIT 1
-        ''', (applicant_id,))
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return row[0] if row else None
+    row = next(iter_applicant_rows(applicant_id, include_text=False, limit=1), None)
+    return row.cv_path if row else None
+
+def get_cv_text_by_id(applicant_id: int) -> str:
+    row = next(iter_applicant_rows(applicant_id, limit=1), None)
+    return decompress_text(row.cv_text) if row and row.cv_text is not None else None
 
 def get_summary_by_id(applicant_id: int):
-    cv_path = get_cv_path_by_id(applicant_id)
-    if not cv_path:
+    row = next(iter_applicant_rows(applicant_id, limit=1), None)
+    if not row or not row.cv_path:
         return None
-    data = extract_summary_data_from_pdf(cv_path)
+    if row.cv_text is not None:
+        data = extract_detailed_info(decompress_text(row.cv_text))
+    else:
+        data = extract_summary_data_from_pdf(row.cv_path)
 
-    conn = get_connection()
-    cursor = conn.cursor()
+    key, data.nama = decrypt_applicant(row)
     data.email =  None
-
-    cursor.execute('''
-        SELECT enc.C1_x, enc.C1_y, enc.SPN_key
-        FROM EncryptionParameters enc WHERE enc.applicant_id = %s
-        ''', (applicant_id,))
-
-    enc_params = cursor.fetchall()
-    key = None
-    if enc_params:
-        key = ENC.decrypt_key_from_id(enc_params[0])
-    
-    cursor.execute('SELECT first_name, last_name FROM ApplicantProfile WHERE applicant_id = %s', (applicant_id,))
-    row = cursor.fetchone()
-    data.nama = f"{ENC.decrypt_spn(row[0], key) if row else None} {ENC.decrypt_spn(row[1], key) if row else None}"
-
-    cursor.execute('SELECT phone_number FROM ApplicantProfile WHERE applicant_id = %s', (applicant_id,))
-    row = cursor.fetchone()
-    data.phone = ENC.decrypt_spn(row[0], key) if row else None
-
-    cursor.execute('SELECT address FROM ApplicantProfile WHERE applicant_id = %s', (applicant_id,))
-    row = cursor.fetchone()
-    data.address = ENC.decrypt_spn(row[0], key) if row else None
-
-    cursor.close()
-    conn.close()
+    data.phone, data.address = ENC.decrypt_spn_many([row.phone_number, row.address], key)
 
     return data.nama, data.email, data.phone, data.address, data.skills, data.experience, data.education, data.summary
 
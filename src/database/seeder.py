@@ -1,42 +1,34 @@
 import mysql.connector
-import dotenv
+import sqlite3
 import os
-from encryption.encryption import encrypt_ecc, encrypt_spn
+from encryption.encryption import encrypt_ecc_batch, encrypt_spn_many
+import database.db as db
+import database.sqlite_backend as sqlite_backend
 import traceback
 
-dotenv.load_dotenv()  # Load environment variables from .env file
-DB_HOST = os.getenv("DB_HOST") 
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD") 
-DB_NAME = os.getenv("DB_NAME")
-
 def encrypt_seed():
     conn = None  
     try:
-        conn = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
+        conn = db.get_connection()
         read_cursor = conn.cursor(dictionary=True)
         write_cursor = conn.cursor()
 
         read_cursor.execute("SELECT * FROM ApplicantProfilePlain")
         all_applicants = read_cursor.fetchall()
 
-        for applicant in all_applicants:
-            applicant_id = applicant['app_id']
-
-            key = os.urandom(32)
+        keys = [os.urandom(32) for _ in all_applicants]
+        wrapped_keys = encrypt_ecc_batch(keys)  # semua kunci SPN dibungkus ECC dalam satu batch
 
-            first_name_encrypted = encrypt_spn(applicant['first_name'], key)
-            last_name_encrypted = encrypt_spn(applicant['last_name'], key)
-            dob_encrypted = encrypt_spn(str(applicant['date_of_birth']), key)
-            address_encrypted = encrypt_spn(applicant['address'], key)
-            phone_encrypted = encrypt_spn(applicant['phone_number'], key)
+        for applicant, key, ((C1_x, C1_y), encrypted_key) in zip(all_applicants, keys, wrapped_keys):
+            applicant_id = applicant['app_id']
 
-            (C1_x, C1_y), encrypted_key = encrypt_ecc(key)
+            first_name_encrypted, last_name_encrypted, dob_encrypted, address_encrypted, phone_encrypted = encrypt_spn_many([
+                applicant['first_name'],
+                applicant['last_name'],
+                str(applicant['date_of_birth']),
+                applicant['address'],
+                applicant['phone_number'],
+            ], key)
 
             sql_insert_profile = """
                 INSERT INTO ApplicantProfile 
@@ -63,38 +55,35 @@ def encrypt_seed():
     except Exception as e:
         traceback.print_exc()
 
-def seed_database():
-    with open("src/database/tubes3_seeding.sql", 'r', encoding='utf-8') as f:
+def run_sql_file(cursor, conn, path: str):
+    """
+    Menjalankan file dump MySQL perintah demi perintah, di-commit satu per satu.
+    Untuk backend SQLite setiap perintah diterjemahkan dulu ke dialek SQLite.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
         sql_commands = f.read()
 
-    conn = mysql.connector.connect(
-        host=DB_HOST,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME,
-        autocommit=True
-    )
-    cursor = conn.cursor()
-
     for command in sql_commands.split(';'):
         command = command.strip()
+        if command and db.DB_BACKEND == "sqlite":
+            command = sqlite_backend.translate_mysql(command)
         if command:
             try:
                 cursor.execute(command)
-            except mysql.connector.Error as err:
+                conn.commit()
+            except (mysql.connector.Error, sqlite3.Error) as err:
                 print(f"Error executing: {command[:30]}... → {err}")
-    encrypt_seed()
 
-    with open("src/database/application_seed.sql", 'r', encoding='utf-8') as f:
-        sql_commands = f.read()
+def seed_database():
+    conn = db.get_connection()
+    cursor = conn.cursor()
 
-    for command in sql_commands.split(';'):
-        command = command.strip()
-        if command:
-            try:
-                cursor.execute(command)
-            except mysql.connector.Error as err:
-                print(f"Error executing: {command[:30]}... → {err}")
+    run_sql_file(cursor, conn, "src/database/tubes3_seeding.sql")
+    encrypt_seed()
+    run_sql_file(cursor, conn, "src/database/application_seed.sql")
+    db.create_tables_if_not_exist()  # CVText, TokenIndex, IndexGeneration tidak dibuat oleh file seed
+    db.bump_index_generation(cursor)  # seed menulis ulang ApplicationDetail dengan detail_id tetap
+    conn.commit()
 
     cursor.close()
     conn.close()
@@ -0,0 +1,346 @@
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+
+# Same tables as create_tables_if_not_exist for MySQL, in SQLite's dialect
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS ApplicantProfile (
+        applicant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name BLOB DEFAULT NULL,
+        last_name BLOB DEFAULT NULL,
+        date_of_birth BLOB DEFAULT NULL,
+        address BLOB DEFAULT NULL,
+        phone_number BLOB DEFAULT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS EncryptionParameters (
+        applicant_id INTEGER NOT NULL,
+        C1_x BLOB,
+        C1_y BLOB,
+        SPN_key BLOB,
+        FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS ApplicationDetail (
+        detail_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        applicant_id INTEGER NOT NULL,
+        application_role VARCHAR(100) DEFAULT NULL,
+        cv_path TEXT,
+        FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS CVText (
+        detail_id INTEGER PRIMARY KEY,
+        cv_text BLOB NOT NULL,
+        FOREIGN KEY (detail_id) REFERENCES ApplicationDetail(detail_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS TokenIndex (
+        token VARCHAR(255) COLLATE BINARY NOT NULL,
+        detail_id INTEGER NOT NULL,
+        term_frequency INTEGER NOT NULL,
+        PRIMARY KEY (token, detail_id),
+        FOREIGN KEY (detail_id) REFERENCES ApplicationDetail(detail_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS IndexGeneration (
+        id INTEGER PRIMARY KEY,
+        generation INTEGER NOT NULL
+    )
+    ''',
+    "INSERT OR IGNORE INTO IndexGeneration (id, generation) VALUES (1, 0)",
+    "CREATE INDEX IF NOT EXISTS TokenIndex_detail_id ON TokenIndex (detail_id)",
+    "CREATE INDEX IF NOT EXISTS EncryptionParameters_applicant_id ON EncryptionParameters (applicant_id)",
+    "CREATE INDEX IF NOT EXISTS ApplicationDetail_applicant_id ON ApplicationDetail (applicant_id)",
+]
+
+class SQLiteCursor():
+    """
+    sqlite3 cursor with the parts of the mysql.connector cursor API database.db uses:
+    %s placeholders and dictionary rows.
+    """
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+        self._cursor = cursor
+        if dictionary:
+            self._cursor.row_factory = sqlite3.Row
+        self._dictionary = dictionary
+
+    @staticmethod
+    def _translate(query: str) -> str:
+        return query.replace("%s", "?")
+
+    def _row(self, row):
+        return dict(row) if self._dictionary and row is not None else row
+
+    def execute(self, query: str, params=()):
+        self._cursor.execute(self._translate(query), params)
+
+    def executemany(self, query: str, seq_params):
+        self._cursor.executemany(self._translate(query), seq_params)
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def lastrowid(self) -> int:
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection():
+    """
+    sqlite3 connection in WAL mode with foreign keys on, shaped like a mysql.connector connection.
+    """
+    unread_result = False  # sqlite3 never blocks the connection on an unread result
+
+    def __init__(self, path: str, timeout: float = 30):
+        self._conn = sqlite3.connect(path, timeout=timeout)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self, dictionary: bool = False) -> SQLiteCursor:
+        return SQLiteCursor(self._conn.cursor(), dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        self._conn.close()
+
+class SQLitePool():
+    """
+    Stands in for mysql.connector's pool. Opening a local SQLite file is cheap,
+    so every checkout gets its own connection (sqlite3 connections are per thread).
+    """
+    def __init__(self, path: str, timeout: float = 30):
+        self.path = path
+        self.timeout = timeout
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def get_connection(self) -> SQLiteConnection:
+        return SQLiteConnection(self.path, self.timeout)
+
+def translate_mysql(statement: str) -> str | None:
+    """
+    Rewrites one statement of the MySQL seed dumps for SQLite, or None to skip it.
+    """
+    if re.match(r"\s*SET\s+NAMES\b", statement, re.IGNORECASE):
+        return None
+    checks = re.match(r"\s*SET\s+FOREIGN_KEY_CHECKS\s*=\s*(\d)", statement, re.IGNORECASE)
+    if checks:
+        return f"PRAGMA foreign_keys = {'ON' if checks.group(1) == '1' else 'OFF'}"
+    statement = re.sub(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", "INTEGER PRIMARY KEY AUTOINCREMENT", statement, flags=re.IGNORECASE)
+    statement = re.sub(r"\)\s*ENGINE\s*=\s*\w+[^;]*$", ")", statement, flags=re.IGNORECASE)
+    return statement
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    def setUp(self):
+        import database.db as db
+        self.db = db
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db.configure_backend("sqlite", os.path.join(self.temp_dir.name, "test.sqlite3"))
+        self.assertTrue(db.init_database())
+
+    def tearDown(self):
+        self.db.configure_backend(os.getenv("DB_BACKEND", "mysql"))
+        self.temp_dir.cleanup()
+
+    def insert(self, names: list[tuple[str, str]], text: str = "Skills\nPython SQL\nEducation\nITB") -> None:
+        import encryption.encryption as ENC
+        from algorithms.InvertedIndex import InvertedIndex
+        records = []
+        keys = [os.urandom(32) for _ in names]
+        for (first_name, last_name), key, ((C1_x, C1_y), cipherkey) in zip(names, keys, ENC.encrypt_ecc_batch(keys)):
+            profile = tuple(ENC.encrypt_spn_many([first_name, last_name, "2000-01-01", "Jl. Ganesha 10", "628123"], key))
+            records.append(self.db.CVRecord(
+                f"cv/{first_name}.pdf", "Engineer", profile,
+                (C1_x.to_bytes(32, "big"), C1_y.to_bytes(32, "big"), cipherkey),
+                self.db.compress_text(text), InvertedIndex.tokenize(text)
+            ))
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        self.db.write_cv_records(cursor, records)
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+    def test_wal_mode(self):
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA journal_mode")
+        self.assertEqual(cursor.fetchone()[0], "wal")
+        cursor.close()
+        conn.close()
+
+    def test_insert_and_load(self):
+        self.insert([("Budi", "Santoso"), ("Siti", "Aminah")])
+        self.assertEqual(self.db.get_cv_count(), 2)
+        data = self.db.load_search_data_from_sql()
+        self.assertEqual([d.name for d in data], ["Budi Santoso", "Siti Aminah"])
+        self.assertIn("Python", data[0].text)
+        self.assertEqual(self.db.get_cv_path_by_id(2), "cv/Siti.pdf")
+
+        name, email, phone, address, skills, experience, education, summary = self.db.get_summary_by_id(1)
+        self.assertEqual((name, phone, address), ("Budi Santoso", "628123", "Jl. Ganesha 10"))
+        self.assertEqual(skills, ["Python SQL"])
+        self.assertEqual(education, ["ITB"])
+
+    def test_token_index_round_trip(self):
+        self.insert([("Budi", "Santoso")], "Python Python SQL")
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        self.db.store_cv_text(cursor, 1, "Java Java Java")  # upsert replaces the stored text and tokens
+        conn.commit()
+        cursor.execute("SELECT token, term_frequency FROM TokenIndex WHERE detail_id = %s", (1,))
+        self.assertEqual(cursor.fetchall(), [("Java", 3)])
+        cursor.close()
+        conn.close()
+        self.assertEqual(self.db.get_cv_text_by_id(1), "Java Java Java")
+
+    def test_reset_tables_restarts_ids(self):
+        self.insert([("Budi", "Santoso")])
+        self.db.reset_tables()
+        self.assertEqual(self.db.get_cv_count(), 0)
+        self.insert([("Siti", "Aminah")])
+        self.assertEqual(self.db.get_cv_path_by_id(1), "cv/Siti.pdf")
+
+    def test_token_index_follows_other_hosts(self):
+        self.insert([("Budi", "Santoso")], "Python SQL")
+        self.assertEqual(self.db.get_token_index().candidates(["Python"]), {1})
+
+        # another host resets the tables and reuses detail_id 1 for a different CV
+        raw = sqlite3.connect(self.db.SQLITE_PATH)
+        raw.execute("DELETE FROM TokenIndex")
+        raw.execute("INSERT INTO TokenIndex (token, detail_id, term_frequency) VALUES ('Java', 1, 2)")
+        raw.execute("UPDATE IndexGeneration SET generation = generation + 1 WHERE id = 1")
+        raw.commit()
+        index = self.db.get_token_index()
+        self.assertEqual(index.candidates(["Python"]), set())
+        self.assertEqual(index.candidates(["Java"]), {1})
+
+        # and then uploads a new CV without a reset
+        raw.execute("INSERT INTO TokenIndex (token, detail_id, term_frequency) VALUES ('Golang', 7, 1)")
+        raw.commit()
+        raw.close()
+        self.assertEqual(self.db.get_token_index().candidates(["Golang", "Java"]), {1, 7})
+
+    def test_applicant_cache_ignores_reused_ids(self):
+        self.insert([("Budi", "Santoso")])
+        self.assertEqual(self.db.get_summary_by_id(1)[0], "Budi Santoso")
+
+        # another host resets the tables, applicant_id 1 now belongs to someone else
+        raw = sqlite3.connect(self.db.SQLITE_PATH)
+        for table in ("EncryptionParameters", "TokenIndex", "CVText", "ApplicationDetail", "ApplicantProfile", "sqlite_sequence"):
+            raw.execute(f"DELETE FROM {table}")
+        raw.commit()
+        raw.close()
+        self.insert([("Siti", "Aminah")])
+        self.assertEqual(self.db.get_summary_by_id(1)[:4], ("Siti Aminah", None, "628123", "Jl. Ganesha 10"))
+        self.assertEqual([d.name for d in self.db.load_search_data_from_sql()], ["Siti Aminah"])
+
+    def test_load_cancelled(self):
+        from interface import iter_search_algorithm
+        self.insert([("Budi", "Santoso"), ("Siti", "Aminah")])
+        self.assertIsNone(self.db.load_search_data_from_sql(cancelled=lambda: True))
+        self.assertEqual(list(iter_search_algorithm("KMP", ["Python"], workers=1, cancelled=lambda: True)), [])
+        self.assertEqual(len(self.db.load_search_data_from_sql()), 2)
+
+    def test_search_streams_batches(self):
+        from benchmarks.pdf_corpus import generate_pdf_corpus
+        from interface import iter_search_algorithm
+        folder = os.path.join(self.temp_dir.name, "pdf")
+        generate_pdf_corpus(folder, 5)
+        self.db.insert_folder_pdfs_to_mysql(folder, "Engineer", workers=1)
+        raw = sqlite3.connect(self.db.SQLITE_PATH)
+        raw.execute("DELETE FROM CVText WHERE detail_id IN (2, 4)")  # like seeded rows, extracted on the first search
+        raw.commit()
+        raw.close()
+
+        self.assertEqual([len(batch) for batch in self.db.iter_search_data(2)], [2, 2, 1])
+        self.assertIsNotNone(self.db.get_cv_text_by_id(2))
+
+        def results(progress):
+            return [(r.id, r.keywords) for r in progress.results]
+        snapshots = list(iter_search_algorithm("KMP", ["Python", "SQL", "Excel"], limit=5, workers=1, batch_size=2))
+        self.assertEqual([(p.scanned, p.total) for p in snapshots], [(2, 5), (4, 5), (5, 5)])
+        whole = list(iter_search_algorithm("KMP", ["Python", "SQL", "Excel"], limit=5, workers=1))[-1]
+        parallel = list(iter_search_algorithm("KMP", ["Python", "SQL", "Excel"], limit=5, workers=2, batch_size=1))[-1]
+        self.assertEqual(results(snapshots[-1]), results(whole))
+        self.assertEqual(results(parallel), results(whole))
+
+    def test_fuzzy_counts_only_for_missed_keywords(self):
+        from unittest import mock
+        from algorithms.InvertedIndex import InvertedIndex
+        from interface import run_search_algorithm
+        self.insert([("Budi", "Santoso"), ("Siti", "Aminah")], "Python SQL")
+        with mock.patch.object(InvertedIndex, "fuzzy_counts", autospec=True, side_effect=InvertedIndex.fuzzy_counts) as fuzzy_counts:
+            results, _, _ = run_search_algorithm("KMP", ["Python", "SQL"], workers=1)
+            self.assertEqual(fuzzy_counts.call_count, 0)
+            results, _, _ = run_search_algorithm("KMP", ["Python", "Pythn"], workers=1)
+            self.assertEqual([call.args[1] for call in fuzzy_counts.call_args_list], ["Pythn"])
+        self.assertEqual([r.keywords for r in results], [{"Python": 1, "Pythn": 1}] * 2)
+
+    def test_parallel_ingest_distinct_identities(self):
+        from benchmarks.pdf_corpus import generate_pdf_corpus
+        folder = os.path.join(self.temp_dir.name, "pdf")
+        generate_pdf_corpus(folder, 12)
+        self.db.insert_folder_pdfs_to_mysql(folder, "Engineer", workers=3)
+
+        identities = set()
+        for applicant_id in range(1, 13):
+            name, email, phone, address, *_ = self.db.get_summary_by_id(applicant_id)
+            identities.add((name, address))
+        self.assertEqual(len(identities), 12)  # forked workers must not share faker's RNG state
+
+    def test_seed_keeps_index_tables(self):
+        import database.seeder as seeder
+        seeder.seed_database()
+        for table in ("CVText", "TokenIndex"):
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            self.assertEqual(cursor.fetchone()[0], 0)
+            cursor.close()
+            conn.close()
+        self.assertEqual(self.db.get_token_index().candidates(["Python"]), set())
+        self.assertGreater(self.db.get_cv_count(), 0)
+
+    def test_translate_mysql(self):
+        self.assertIsNone(translate_mysql("SET NAMES 'utf8mb4' COLLATE 'utf8mb4_unicode_ci'"))
+        self.assertEqual(translate_mysql("SET FOREIGN_KEY_CHECKS = 0"), "PRAGMA foreign_keys = OFF")
+        self.assertEqual(
+            translate_mysql("CREATE TABLE T (\n    id INT AUTO_INCREMENT PRIMARY KEY\n)ENGINE=InnoDB DEFAULT CHARSET=utf8mb4").split(),
+            "CREATE TABLE T ( id INTEGER PRIMARY KEY AUTOINCREMENT )".split()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
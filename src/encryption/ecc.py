@@ -1,4 +1,5 @@
 import random
+import unittest
 from typing import Optional, Tuple
 
 G128 = (
@@ -10,6 +11,12 @@ a128 = -3
 b128 = int("E87579C11079F43DD824993C2CEE5ED3", 16)
 
 Point = Optional[Tuple[int, int]]
+JacobianPoint = Tuple[int, int, int]  # (X, Y, Z) stands for (X/Z^2, Y/Z^3), Z == 0 is the point at infinity
+INFINITY : JacobianPoint = (1, 1, 0)
+
+ENGINES = ("affine", "jacobian")
+DEFAULT_ENGINE = "jacobian"
+WNAF_WIDTH : int = 4
 class EllipticCurve:
     def __init__(self, a : int=a128, b : int=b128, p : int=p128):
         """
@@ -48,9 +55,20 @@ def point_doubling(P : Point, curve : EllipticCurve):
     y3 = (m * (x - x3) - y) % curve.p
     return (x3, y3)  # Return new point
 
-def scalar_multiplication(k : int, P : Point, curve : EllipticCurve) -> Point | None:
+def scalar_multiplication(k : int, P : Point, curve : EllipticCurve, engine : str = DEFAULT_ENGINE) -> Point | None:
+    """
+    k * P on the elliptic curve with the selected engine. Both engines return the same point.
+    """
+    if engine == "affine":
+        return affine_scalar_multiplication(k, P, curve)
+    if engine == "jacobian":
+        return wnaf_scalar_multiplication(k, P, curve)
+    raise ValueError(f"Unknown ECC engine: {engine}")
+
+def affine_scalar_multiplication(k : int, P : Point, curve : EllipticCurve) -> Point | None:
     """
     k * P on the elliptic curve using the double-and-add algorithm.
+    Every addition and doubling costs one modular inversion.
     """
     if k == 0 or P is None:  return None
 
@@ -65,9 +83,256 @@ def scalar_multiplication(k : int, P : Point, curve : EllipticCurve) -> Point |
 
     return result
 
-def generate_keys(curve : EllipticCurve, G : Point=G128) -> Tuple[int, Point]:
+# ------------------------------ JACOBIAN COORDINATES ------------------------------
+# None of the formulas use b, just like the affine ones, so both engines agree
+# even for points (such as G128) that are not reduced or not on the curve.
+
+def to_jacobian(P : Point, curve : EllipticCurve) -> JacobianPoint:
+    if P is None: return INFINITY
+    return (P[0] % curve.p, P[1] % curve.p, 1)
+
+def from_jacobian(P : JacobianPoint, curve : EllipticCurve) -> Point:
+    X, Y, Z = P
+    if Z == 0: return None
+    z_inv = pow(Z, -1, curve.p)
+    z_inv2 = z_inv * z_inv % curve.p
+    return (X * z_inv2 % curve.p, Y * z_inv2 * z_inv % curve.p)
+
+def jacobian_doubling(P : JacobianPoint, curve : EllipticCurve) -> JacobianPoint:
+    X, Y, Z = P
+    if Z == 0 or Y == 0: return INFINITY
+    p = curve.p
+
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    ZZ = Z * Z % p
+    if curve.a % p == p - 3:
+        M = 3 * (X - ZZ) * (X + ZZ) % p  # 3X^2 - 3Z^4 without squaring Z^2
+    else:
+        M = (3 * X * X + curve.a * ZZ * ZZ) % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y * Z % p
+    return (X3, Y3, Z3)
+
+def jacobian_mixed_addition(P : JacobianPoint, Q : Point, curve : EllipticCurve) -> JacobianPoint:
+    """
+    P + Q for a Jacobian P and an affine Q (reduced mod p).
+    """
+    if Q is None: return P
+    X1, Y1, Z1 = P
+    if Z1 == 0: return (Q[0], Q[1], 1)
+    p = curve.p
+
+    Z1Z1 = Z1 * Z1 % p
+    U2 = Q[0] * Z1Z1 % p
+    S2 = Q[1] * Z1 * Z1Z1 % p
+    H = (U2 - X1) % p
+    r = (S2 - Y1) % p
+    if H == 0:
+        return jacobian_doubling(P, curve) if r == 0 else INFINITY
+
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+    return (X3, Y3, Z3)
+
+def batch_inverse(values : list[int], p : int) -> list[int]:
+    """
+    Inverts every (non-zero) value mod p with a single modular inversion (Montgomery's trick).
+    """
+    prefix : list[int] = []
+    acc : int = 1
+    for v in values:
+        prefix.append(acc)
+        acc = acc * v % p
+
+    acc = pow(acc, -1, p)
+    inverses : list[int] = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = acc * prefix[i] % p
+        acc = acc * values[i] % p
+    return inverses
+
+def batch_from_jacobian(points : list[JacobianPoint], curve : EllipticCurve) -> list[Point]:
+    """
+    Converts finite Jacobian points to affine sharing one inversion.
+    """
+    p = curve.p
+    result : list[Point] = []
+    for (X, Y, _), z_inv in zip(points, batch_inverse([P[2] for P in points], p)):
+        z_inv2 = z_inv * z_inv % p
+        result.append((X * z_inv2 % p, Y * z_inv2 * z_inv % p))
+    return result
+
+def wnaf(k : int, w : int = WNAF_WIDTH) -> list[int]:
+    """
+    Width-w non-adjacent form of k, least significant digit first.
+    Non-zero digits are odd, below 2^(w-1) in magnitude and at least w positions apart.
+    """
+    digits : list[int] = []
+    window : int = 1 << w
+    while k > 0:
+        if k & 1:
+            d = k & (window - 1)
+            if d >= window >> 1:
+                d -= window
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+def odd_multiples(P : Point, count : int, curve : EllipticCurve) -> list[Point] | None:
+    """
+    [P, 3P, 5P, ...] (count points) in affine form, or None if one of them is the point at infinity.
+    """
+    P_jac = to_jacobian(P, curve)
+    base = (P_jac[0], P_jac[1])
+    double = jacobian_doubling(P_jac, curve)
+    if double[2] == 0:
+        return None
+    double_affine = from_jacobian(double, curve)
+
+    multiples : list[JacobianPoint] = [P_jac]
+    for _ in range(count - 1):
+        multiples.append(jacobian_mixed_addition(multiples[-1], double_affine, curve))
+    if any(M[2] == 0 for M in multiples):
+        return None
+    return [base] + batch_from_jacobian(multiples[1:], curve)
+
+def wnaf_scalar_multiplication(k : int, P : Point, curve : EllipticCurve, w : int = WNAF_WIDTH) -> Point | None:
+    """
+    k * P using Jacobian coordinates and width-w NAF recoding.
+    Doublings and additions need no inversion; the odd-multiple table and the
+    result are brought back to affine with one inversion each.
+    """
+    if k == 0 or P is None: return None
+    if k == 1: return P  # affine double-and-add returns P as-is, unreduced
+
+    table = odd_multiples(P, 1 << (w - 2), curve)
+    if table is None:
+        # P has tiny order, not worth a fast path
+        return affine_scalar_multiplication(k, P, curve)
+    negated = [(x, -y % curve.p) for x, y in table]
+
+    R : JacobianPoint = INFINITY
+    for d in reversed(wnaf(k, w)):
+        R = jacobian_doubling(R, curve)
+        if d > 0:
+            R = jacobian_mixed_addition(R, table[d >> 1], curve)
+        elif d < 0:
+            R = jacobian_mixed_addition(R, negated[(-d) >> 1], curve)
+    return from_jacobian(R, curve)
+
+# ------------------------------ BATCHED MULTIPLICATION ------------------------------
+
+def batch_point_addition(pairs : list[Tuple[Point, Point]], curve : EllipticCurve) -> list[Point]:
+    """
+    P + Q (doubling when P == Q) for every pair of reduced affine points,
+    sharing one modular inversion across the whole batch (Montgomery's trick,
+    fused with the point formulas). A result that is the point at infinity
+    comes back as None.
+    """
+    p = curve.p
+    denominators : list[int] = []
+    prefix : list[int] = []
+    acc : int = 1
+    for P, Q in pairs:
+        denominator = (2 * P[1] if P == Q else Q[0] - P[0]) % p
+        denominators.append(denominator)
+        prefix.append(acc)
+        if denominator:
+            acc = acc * denominator % p
+
+    inverse : int = pow(acc, -1, p)
+    result : list[Point] = [None] * len(pairs)
+    for j in range(len(pairs) - 1, -1, -1):
+        denominator = denominators[j]
+        if not denominator:
+            continue
+        (x1, y1), (x2, y2) = pairs[j]
+        inverse_j = inverse * prefix[j] % p
+        inverse = inverse * denominator % p
+        if x1 == x2:
+            m = (3 * x1 * x1 + curve.a) * inverse_j % p
+        else:
+            m = (y2 - y1) * inverse_j % p
+        x3 = (m * m - x1 - x2) % p
+        result[j] = (x3, (m * (x1 - x3) - y1) % p)
+    return result
+
+def batch_scalar_multiplication(scalars : list[int], points : list[Point], curve : EllipticCurve, w : int = WNAF_WIDTH) -> list[Point]:
+    """
+    scalars[i] * points[i] for every i, giving the same points as scalar_multiplication.
+
+    All multiplications walk their wNAF digits in lockstep in affine
+    coordinates, so every doubling or addition step costs one inversion for
+    the whole batch instead of one per point (Montgomery's trick). A point
+    that hits the point at infinity midway is finished on its own.
+    """
+    p = curve.p
+    results : list[Point] = [None] * len(points)
+    alive : set[int] = set()
+    for i, (k, P) in enumerate(zip(scalars, points)):
+        if k == 1:
+            results[i] = P  # same as the single-point engines
+        elif k and P is not None:
+            alive.add(i)
+
+    fallback : list[int] = []
+    R : dict[int, Point] = {}
+
+    def step(pairs : dict[int, Tuple[Point, Point]]) -> dict[int, Point]:
+        done : dict[int, Point] = {}
+        for i, S in zip(pairs, batch_point_addition(list(pairs.values()), curve)):
+            if S is None:
+                fallback.append(i)
+                alive.discard(i)
+                R.pop(i, None)
+            else:
+                done[i] = S
+        return done
+
+    # odd multiples P, 3P, 5P, ... of every point
+    tables : dict[int, list[Point]] = {i: [(points[i][0] % p, points[i][1] % p)] for i in alive}
+    doubles = step({i: (tables[i][0], tables[i][0]) for i in sorted(alive)})
+    for _ in range((1 << (w - 2)) - 1):
+        for i, S in step({i: (tables[i][-1], doubles[i]) for i in sorted(alive)}).items():
+            tables[i].append(S)
+
+    digits : dict[int, list[int]] = {i: wnaf(scalars[i], w) for i in alive}
+    length : int = max((len(d) for d in digits.values()), default=0)
+    for t in range(length - 1, -1, -1):
+        if R:
+            R.update(step({i: (R[i], R[i]) for i in sorted(R)}))
+        additions : dict[int, Tuple[Point, Point]] = {}
+        for i in sorted(alive):
+            d = digits[i][t] if t < len(digits[i]) else 0
+            if d == 0:
+                continue
+            Q = tables[i][abs(d) >> 1]
+            if d < 0:
+                Q = (Q[0], -Q[1] % p)
+            if i in R:
+                additions[i] = (R[i], Q)
+            else:
+                R[i] = Q
+        R.update(step(additions))
+
+    for i in alive:
+        results[i] = R[i]
+    for i in fallback:
+        results[i] = scalar_multiplication(scalars[i], points[i], curve)
+    return results
+
+def generate_keys(curve : EllipticCurve, G : Point=G128, engine : str = DEFAULT_ENGINE) -> Tuple[int, Point]:
     d = random.randint(1, curve.p - 1)
-    Q = scalar_multiplication(d, G, curve)
+    Q = scalar_multiplication(d, G, curve, engine)
     return d, Q
 
 def gen_keystream(seed: int, length: int) -> bytes:
@@ -84,25 +349,119 @@ def gen_keystream(seed: int, length: int) -> bytes:
     return bytes(keystream)
 
 
-def encrypt(plaintext: bytes, public_key: Point, curve: EllipticCurve, G: Point) -> Tuple[Point, bytes]:
+def encrypt(plaintext: bytes, public_key: Point, curve: EllipticCurve, G: Point, engine: str = DEFAULT_ENGINE) -> Tuple[Point, bytes]:
     k = random.randint(1, curve.p - 1)
-    C1 = scalar_multiplication(k, G, curve)
-    kQ = scalar_multiplication(k, public_key, curve)
-    
-    shared_x = kQ[0]
-    keystream = gen_keystream(shared_x, len(plaintext))
+    C1 = scalar_multiplication(k, G, curve, engine)
+    kQ = scalar_multiplication(k, public_key, curve, engine)
     
-    ciphertext_bytes = bytes([p_byte ^ k_byte for p_byte, k_byte in zip(plaintext, keystream)])
-    
-    return C1, ciphertext_bytes
+    return C1, apply_keystream(plaintext, kQ[0])
 
 
-def decrypt(ciphertext: bytes, R: Point, private_key: int, curve: EllipticCurve) -> bytes:
-    kQ = scalar_multiplication(private_key, R, curve)
-    
-    shared_x = kQ[0]
-    keystream = gen_keystream(shared_x, len(ciphertext))
+def decrypt(ciphertext: bytes, R: Point, private_key: int, curve: EllipticCurve, engine: str = DEFAULT_ENGINE) -> bytes:
+    kQ = scalar_multiplication(private_key, R, curve, engine)
     
-    plaintext = bytes([c_byte ^ k_byte for c_byte, k_byte in zip(ciphertext, keystream)])
-    
-    return plaintext
\ No newline at end of file
+    return apply_keystream(ciphertext, kQ[0])
+
+def apply_keystream(data: bytes, shared_x: int) -> bytes:
+    """
+    XORs data with the keystream seeded by the shared point's x, which both encrypts and decrypts.
+    """
+    keystream = gen_keystream(shared_x, len(data))
+    return bytes([d_byte ^ k_byte for d_byte, k_byte in zip(data, keystream)])
+
+def encrypt_batch(plaintexts: list[bytes], public_key: Point, curve: EllipticCurve, G: Point) -> list[Tuple[Point, bytes]]:
+    """
+    encrypt for many plaintexts, with all 2n scalar multiplications batched together.
+    """
+    ks = [random.randint(1, curve.p - 1) for _ in plaintexts]
+    n = len(plaintexts)
+    points = batch_scalar_multiplication(ks + ks, [G] * n + [public_key] * n, curve)
+    return [(points[i], apply_keystream(plaintext, points[n + i][0])) for i, plaintext in enumerate(plaintexts)]
+
+def decrypt_batch(ciphertexts: list[bytes], Rs: list[Point], private_key: int, curve: EllipticCurve) -> list[bytes]:
+    """
+    decrypt for many ciphertexts under one private key, sharing inversions across the batch.
+    """
+    shared = batch_scalar_multiplication([private_key] * len(Rs), Rs, curve)
+    return [apply_keystream(ciphertext, kQ[0]) for ciphertext, kQ in zip(ciphertexts, shared)]
+
+
+class TestECC(unittest.TestCase):
+    def setUp(self):
+        self.curve = EllipticCurve()
+        self.rng = random.Random(18)
+
+    def test_wnaf_digits(self):
+        for w in (2, 3, 4, 5):
+            for _ in range(200):
+                k = self.rng.randint(1, 2**130)
+                digits = wnaf(k, w)
+                self.assertEqual(sum(d << i for i, d in enumerate(digits)), k)
+                nonzero = [i for i, d in enumerate(digits) if d]
+                self.assertTrue(all(digits[i] % 2 == 1 and abs(digits[i]) < 1 << (w - 1) for i in nonzero))
+                self.assertTrue(all(b - a >= w for a, b in zip(nonzero, nonzero[1:])))
+
+    def test_batch_inverse(self):
+        values = [self.rng.randint(1, p128 - 1) for _ in range(50)]
+        self.assertEqual(batch_inverse(values, p128), [pow(v, -1, p128) for v in values])
+
+    def test_engines_agree_on_g128(self):
+        for k in [1, 2, 3, 7, 16] + [self.rng.randint(1, p128 - 1) for _ in range(50)]:
+            self.assertEqual(
+                scalar_multiplication(k, G128, self.curve, "jacobian"),
+                scalar_multiplication(k, G128, self.curve, "affine")
+            )
+
+    def test_engines_agree_for_every_width(self):
+        R = scalar_multiplication(self.rng.randint(2, p128 - 1), G128, self.curve, "affine")
+        for w in (2, 3, 4, 5, 6):
+            for _ in range(10):
+                k = self.rng.randint(2, p128 - 1)
+                self.assertEqual(wnaf_scalar_multiplication(k, R, self.curve, w), affine_scalar_multiplication(k, R, self.curve))
+
+    def test_small_curve_matches_affine(self):
+        curve = EllipticCurve(a=2, b=3, p=97)
+        for P in [(3, 6), (80, 10), (0, 10)]:
+            for k in range(1, 120):
+                try:
+                    expected = affine_scalar_multiplication(k, P, curve)
+                except ValueError:
+                    continue  # affine doubling hit y == 0
+                self.assertEqual(wnaf_scalar_multiplication(k, P, curve), expected, (P, k))
+
+    def test_batch_matches_single(self):
+        points = [scalar_multiplication(self.rng.randint(2, p128 - 1), G128, self.curve) for _ in range(20)]
+        scalars = [self.rng.randint(0, p128 - 1) for _ in points[:-3]] + [0, 1, 2]
+        points[-4] = None
+        self.assertEqual(
+            batch_scalar_multiplication(scalars, points, self.curve),
+            [scalar_multiplication(k, P, self.curve, "affine") for k, P in zip(scalars, points)]
+        )
+        self.assertEqual(batch_scalar_multiplication([5, 9], [G128, G128], self.curve), [scalar_multiplication(5, G128, self.curve), scalar_multiplication(9, G128, self.curve)])
+
+    def test_batch_small_curve_falls_back(self):
+        curve = EllipticCurve(a=2, b=3, p=97)
+        P = (3, 6)
+        scalars = list(range(2, 120))
+        self.assertEqual(
+            batch_scalar_multiplication(scalars, [P] * len(scalars), curve),
+            [wnaf_scalar_multiplication(k, P, curve) for k in scalars]
+        )
+
+    def test_batch_encrypt_decrypt(self):
+        private_key, public_key = generate_keys(self.curve)
+        plaintexts = [bytes(self.rng.randrange(256) for _ in range(32)) for _ in range(10)]
+        encrypted = encrypt_batch(plaintexts, public_key, self.curve, G128)
+        self.assertEqual([decrypt(c, C1, private_key, self.curve, "affine") for C1, c in encrypted], plaintexts)
+        self.assertEqual(decrypt_batch([c for _, c in encrypted], [C1 for C1, _ in encrypted], private_key, self.curve), plaintexts)
+
+    def test_decrypt_is_drop_in(self):
+        private_key, public_key = generate_keys(self.curve, engine="affine")
+        plaintext = bytes(self.rng.randrange(256) for _ in range(32))
+        C1, ciphertext = encrypt(plaintext, public_key, self.curve, G128, engine="affine")
+        self.assertEqual(decrypt(ciphertext, C1, private_key, self.curve, engine="jacobian"), plaintext)
+        self.assertEqual(decrypt(ciphertext, C1, private_key, self.curve, engine="affine"), plaintext)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
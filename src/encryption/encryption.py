@@ -11,11 +11,27 @@ def encrypt_ecc(key: bytes):
     C1, cipherkey = ecc.encrypt(key, public_key, curve, G)
     return C1, cipherkey
 
+def encrypt_ecc_batch(keys: list[bytes]):
+    """
+    encrypt_ecc for many keys at once, returns [(C1, cipherkey), ...] in the same order.
+    """
+    curve = ecc.EllipticCurve()
+    with open("src/encryption/parameters/key.pub", "rb") as f:
+        public_key = (int.from_bytes(f.readline().strip(), "big"), int.from_bytes(f.readline().strip(), "big"))
+    return ecc.encrypt_batch(keys, public_key, curve, ecc.G128)
+
+_private_key : int = None  # dibaca sekali dari key.sec
+
+def load_private_key() -> int:
+    global _private_key
+    if _private_key is None:
+        with open("src/encryption/parameters/key.sec", "rb") as f:
+            _private_key = int.from_bytes(f.readline().strip(), "big")
+    return _private_key
+
 def decrypt_ecc(C1, cipherkey: bytes):
     curve = ecc.EllipticCurve()
-    with open("src/encryption/parameters/key.sec", "rb") as f:
-        private_key = int.from_bytes(f.readline().strip(), "big")
-    plaintext = ecc.decrypt(cipherkey, C1, private_key, curve)
+    plaintext = ecc.decrypt(cipherkey, C1, load_private_key(), curve)
     return plaintext
 
 def encrypt_spn(plaintext: str, key: bytes):
@@ -24,9 +40,23 @@ def encrypt_spn(plaintext: str, key: bytes):
 def decrypt_spn(ciphertext: bytes, key: bytes):
     return spn.decrypt(ciphertext, key)
 
+def encrypt_spn_many(plaintexts: list[str], key: bytes):
+    return spn.encrypt_many(plaintexts, key)
+
+def decrypt_spn_many(ciphertexts: list[bytes], key: bytes):
+    return spn.decrypt_many(ciphertexts, key)
+
 def decrypt_key_from_id(row):
     C1_x, C1_y, cipherkey = row
     C1_x = int.from_bytes(C1_x, "big")
     C1_y = int.from_bytes(C1_y, "big")
     key = decrypt_ecc((C1_x, C1_y), cipherkey)
-    return key
\ No newline at end of file
+    return key
+
+def decrypt_keys_batch(rows) -> list[bytes]:
+    """
+    decrypt_key_from_id for many (C1_x, C1_y, cipherkey) rows at once. The private key
+    is loaded once and all scalar multiplications share their modular inversions.
+    """
+    C1s = [(int.from_bytes(C1_x, "big"), int.from_bytes(C1_y, "big")) for C1_x, C1_y, _ in rows]
+    return ecc.decrypt_batch([cipherkey for _, _, cipherkey in rows], C1s, load_private_key(), ecc.EllipticCurve())
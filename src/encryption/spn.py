@@ -1,3 +1,5 @@
+import unittest
+
 BLOCK_SIZE = 8  # bytes
 ROUNDS = 4
 
@@ -25,6 +27,15 @@ INV_S_BOX = bytes([S_BOX.index(i) for i in range(256)])
 P_BOX = [6, 4, 7, 0, 5, 2, 1, 3]
 INV_P_BOX = [P_BOX.index(i) for i in range(BLOCK_SIZE)]
 
+# Every round is bytewise: out[j] = S_BOX[in[P_BOX[j]]] ^ round_key[j]. Substitution
+# and key mixing are fused into one 256-byte table per possible key byte, and the
+# permutation becomes which strided slice each table is applied to, so a round over
+# any number of blocks is BLOCK_SIZE bytes.translate calls.
+_ONES = int.from_bytes(bytes([1] * 256), "big")
+XOR_TABLES = [(int.from_bytes(bytes(range(256)), "big") ^ (k * _ONES)).to_bytes(256, "big") for k in range(256)]
+SUB_XOR_TABLES = [S_BOX.translate(XOR_TABLES[k]) for k in range(256)]        # [b] = S_BOX[b] ^ k
+XOR_INV_SUB_TABLES = [XOR_TABLES[k].translate(INV_S_BOX) for k in range(256)]  # [b] = INV_S_BOX[b ^ k]
+
 def pad(data: bytes) -> bytes:
     padding_len = BLOCK_SIZE - (len(data) % BLOCK_SIZE)
     padding = bytes([padding_len] * padding_len)
@@ -37,6 +48,8 @@ def unpad(data: bytes) -> bytes:
     return data[:-padding_len]
 
 def expand_key(key: bytes) -> list[bytes]:
+    if len(key) < 16:
+        raise ValueError("Key must be at least 16 bytes long.")
     round_keys = []
     for i in range(ROUNDS + 1):
         start = (i * BLOCK_SIZE) % len(key)
@@ -47,43 +60,117 @@ def expand_key(key: bytes) -> list[bytes]:
             round_keys.append((key[start:] + key[:end % len(key)]))
     return round_keys
 
+def encrypt_blocks(data: bytearray, round_keys: list[bytes]) -> bytearray:
+    """
+    Encrypts every block of data (length a multiple of BLOCK_SIZE) in ECB mode.
+    """
+    out = bytearray(len(data))
+    k = round_keys[0]
+    for j in range(BLOCK_SIZE):
+        out[j::BLOCK_SIZE] = data[j::BLOCK_SIZE].translate(XOR_TABLES[k[j]])
+    data, out = out, data
+    for r in range(1, ROUNDS + 1):
+        k = round_keys[r]
+        for j in range(BLOCK_SIZE):
+            out[j::BLOCK_SIZE] = data[P_BOX[j]::BLOCK_SIZE].translate(SUB_XOR_TABLES[k[j]])
+        data, out = out, data
+    return data
+
+def decrypt_blocks(data: bytearray, round_keys: list[bytes]) -> bytearray:
+    """
+    Inverse of encrypt_blocks.
+    """
+    out = bytearray(len(data))
+    for r in range(ROUNDS, 0, -1):
+        k = round_keys[r]
+        for j in range(BLOCK_SIZE):
+            out[j::BLOCK_SIZE] = data[INV_P_BOX[j]::BLOCK_SIZE].translate(XOR_INV_SUB_TABLES[k[INV_P_BOX[j]]])
+        data, out = out, data
+    k = round_keys[0]
+    for j in range(BLOCK_SIZE):
+        out[j::BLOCK_SIZE] = data[j::BLOCK_SIZE].translate(XOR_TABLES[k[j]])
+    return out
+
 def encrypt(plaintext: str, key: bytes) -> bytes:
-    plaintext = plaintext.encode()
-    if len(key) < 16:
-        raise ValueError("Key must be at least 16 bytes long.")
-    
+    return bytes(encrypt_blocks(bytearray(pad(plaintext.encode())), expand_key(key)))
+
+def decrypt(ciphertext: bytes, key: bytes) -> str:
     round_keys = expand_key(key)
-    padded_plaintext = pad(plaintext)
-    ciphertext = b''
+    if len(ciphertext) % BLOCK_SIZE:
+        raise ValueError("Ciphertext length must be a multiple of the block size.")
+    return unpad(bytes(decrypt_blocks(bytearray(ciphertext), round_keys))).decode()
+
+def encrypt_many(plaintexts: list[str], key: bytes) -> list[bytes]:
+    """
+    Encrypts many fields under one key schedule, processing all their blocks in one pass.
+    """
+    round_keys = expand_key(key)
+    padded = [pad(plaintext.encode()) for plaintext in plaintexts]
+    data = encrypt_blocks(bytearray(b"".join(padded)), round_keys)
+
+    result = []
+    offset = 0
+    for block in padded:
+        result.append(bytes(data[offset:offset + len(block)]))
+        offset += len(block)
+    return result
+
+def decrypt_many(ciphertexts: list[bytes], key: bytes) -> list[str]:
+    """
+    Decrypts many fields encrypted under the same key, processing all their blocks in one pass.
+    """
+    round_keys = expand_key(key)
+    if any(len(ciphertext) % BLOCK_SIZE for ciphertext in ciphertexts):
+        raise ValueError("Ciphertext length must be a multiple of the block size.")
+    data = decrypt_blocks(bytearray(b"".join(ciphertexts)), round_keys)
+
+    result = []
+    offset = 0
+    for ciphertext in ciphertexts:
+        result.append(unpad(bytes(data[offset:offset + len(ciphertext)])).decode())
+        offset += len(ciphertext)
+    return result
 
+
+# the original block-at-a-time implementation, kept as the reference for tests and benchmarks
+def reference_encrypt(plaintext: str, key: bytes) -> bytes:
+    round_keys = expand_key(key)
+    padded_plaintext = pad(plaintext.encode())
+    ciphertext = b''
     for i in range(0, len(padded_plaintext), BLOCK_SIZE):
         block = padded_plaintext[i:i+BLOCK_SIZE]
-        
         block = bytes(a ^ b for a, b in zip(block, round_keys[0]))
         for r in range(1, ROUNDS + 1):
             block = bytes(S_BOX[b] for b in block)
             block = bytes(block[P_BOX[j]] for j in range(BLOCK_SIZE))
             block = bytes(a ^ b for a, b in zip(block, round_keys[r]))
-            
         ciphertext += block
-        
     return ciphertext
 
-def decrypt(ciphertext: bytes, key: bytes) -> str:
-    if len(key) < 16:
-        raise ValueError("Key must be at least 16 bytes long.")
 
-    round_keys = expand_key(key)
-    plaintext = b''
+class TestSPN(unittest.TestCase):
+    def setUp(self):
+        self.key = bytes(range(7, 39))
+        self.plaintexts = ["", "Budi", "Santoso", "1990-01-01", "628123456789", "Jl. Ganesha No. 10, Bandung " * 20, "ñandú ✓"]
 
-    for i in range(0, len(ciphertext), BLOCK_SIZE):
-        block = ciphertext[i:i+BLOCK_SIZE]
+    def test_matches_reference(self):
+        for key in (self.key, bytes(range(16)), bytes(range(200, 221))):
+            for plaintext in self.plaintexts:
+                self.assertEqual(encrypt(plaintext, key), reference_encrypt(plaintext, key))
 
-        for r in range(ROUNDS, 0, -1):
-            block = bytes(a ^ b for a, b in zip(block, round_keys[r]))
-            block = bytes(block[INV_P_BOX[j]] for j in range(BLOCK_SIZE))
-            block = bytes(INV_S_BOX[b] for b in block)
-        
-        block = bytes(a ^ b for a, b in zip(block, round_keys[0]))
-        plaintext += block
-    return unpad(plaintext).decode()
\ No newline at end of file
+    def test_round_trip(self):
+        for plaintext in self.plaintexts:
+            self.assertEqual(decrypt(encrypt(plaintext, self.key), self.key), plaintext)
+
+    def test_many_matches_single(self):
+        encrypted = encrypt_many(self.plaintexts, self.key)
+        self.assertEqual(encrypted, [encrypt(plaintext, self.key) for plaintext in self.plaintexts])
+        self.assertEqual(decrypt_many(encrypted, self.key), self.plaintexts)
+
+    def test_short_key(self):
+        with self.assertRaises(ValueError):
+            encrypt("Budi", bytes(15))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -2,10 +2,13 @@ from typing import List
 from algorithms.KMP import KMP
 from algorithms.BM import BM
 from algorithms.AhoCorasick import AhoCorasick
+from algorithms.WuManber import WuManber
 from algorithms.Levenshtein import Levenshtein
 import time
 import datetime
 import os
+import heapq
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from database.db import *
 from database.seeder import *
 
@@ -34,14 +37,50 @@ class ResultData():
         return f"[RESULT] ID: {self.id}\nName: {self.name}\nKeywords: {keywords_str}"
 
 class SearchData():
-    def __init__(self, id: int, name: str, text: str):
+    def __init__(self, id: int, name: str, text: str, detail_id: int = None):
         self.id = id
         self.name = name
         self.text = text
+        self.detail_id = detail_id
 
     def to_string(self) -> str:
         return f"[SEARCH] ID: {self.id}\nName: {self.name}\nText: {self.text}"
 
+class TopResults():
+    """
+    Bounded min-heap holding the best `limit` ResultData seen so far.
+    Ties keep the CV that came first, like a stable sort would.
+    """
+    def __init__(self, limit: int):
+        self.limit = max(0, limit)
+        self.heap: list[tuple[int, int, ResultData]] = []
+
+    def push(self, res: ResultData, order: int) -> None:
+        item = (sum(res.keywords.values()), -order, res)
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, item)
+        elif self.heap and item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def merge(self, other: "TopResults") -> None:
+        for score, order, res in other.heap:
+            self.push(res, -order)
+
+    def results(self) -> List[ResultData]:
+        return [item[2] for item in sorted(self.heap, key=lambda item: (-item[0], -item[1]))]
+
+class SearchProgress():
+    def __init__(self, results: List[ResultData], scanned: int, total: int, exact_time: float, fuzzy_time: float, worker_times: dict[int, list[float]]):
+        self.results = results
+        self.scanned = scanned
+        self.total = total
+        self.exact_time = exact_time
+        self.fuzzy_time = fuzzy_time
+        self.worker_times = worker_times
+
+    def to_string(self) -> str:
+        return f"[PROGRESS] Scanned: {self.scanned}/{self.total}\nResults: {len(self.results)}\nExact: {self.exact_time} ms\nFuzzy: {self.fuzzy_time} ms"
+
 
 def get_summary_data(id:int) -> SummaryData:
     """
@@ -96,28 +135,66 @@ def fuzzy_match(keyword: str, text: str) -> int:
     lv = Levenshtein()
     return lv.count_occurrence(text, keyword)
 
-def run_search_algorithm(algorithm: str, keyword: list[str], limit: int = 10) -> tuple[List[ResultData], int, int]:
+SEARCH_WORKERS : int = int(os.getenv("SEARCH_WORKERS", "1"))
+SEARCH_BATCH_SIZE : int = 256
+SEARCH_MAX_PENDING_PER_WORKER : int = 2
+FUZZY_THRESHOLD : float = 0.8
+
+_search_pool : ProcessPoolExecutor = None
+_search_pool_workers : int = 0
+
+def get_search_pool(workers: int) -> ProcessPoolExecutor:
     """
-    Runs the specified search algorithm with the given query.
+    Returns the process pool used for parallel searches, reusing it between queries.
+    """
+    global _search_pool, _search_pool_workers
+    if _search_pool is None or _search_pool_workers != workers:
+        if _search_pool is not None:
+            _search_pool.shutdown(wait=False)
+        _search_pool = ProcessPoolExecutor(max_workers=workers)
+        _search_pool_workers = workers
+    return _search_pool
+
+def search_chunk(algorithm: str, keyword: list[str], chunk: List[SearchData], excluded: set[int], fuzzy_counts: dict[str, dict[int, int]] = None, indexed: set[int] = None, threshold: float = FUZZY_THRESHOLD, limit: int = 10, offset: int = 0) -> tuple[int, int, TopResults, float, float]:
+    """
+    Runs the exact pass and the Levenshtein fallback over one chunk of CVs.
+    Only keywords without an exact hit are fuzzy matched, once per CV, and
+    keywords with an exact hit keep their exact count.
 
     Args:
         algorithm (str): The name of the search algorithm to run.
         keyword (list of string): Keywords that need to be searched.
-        limit (int, optional): The maximum number of results to return. Defaults to 10.
+        chunk (List[SearchData]): The CVs to search.
+        excluded (set of int): detail_ids known to contain none of the keywords.
+        fuzzy_counts (dict, optional): Per keyword, fuzzy match counts by detail_id from the vocabulary index,
+            only for keywords some indexed CV of the chunk misses.
+        indexed (set of int, optional): detail_ids covered by fuzzy_counts.
+        threshold (float, optional): Minimum Levenshtein similarity for a fuzzy match.
+        limit (int, optional): How many of the best CVs of the chunk to keep.
+        offset (int, optional): Position of the chunk in the whole corpus, used to break ties.
 
     Returns:
-        List[ResultData]: A list of data matching the search criteria.
-        int : Exact Match Time
-        int : Fuzzy Match Time
+        int : Process id of the worker
+        int : Number of CVs scanned
+        TopResults: The best CVs of the chunk with at least one match.
+        float : Exact Match Time
+        float : Fuzzy Match Time
     """
-
-    search = load_search_data_from_sql()
-
     exact_time = 0
     fuzzy_time = 0
-    results = []
-    
-    for data in search:
+    top = TopResults(limit)
+
+    if algorithm == "AhoCorasick":
+        # automaton dibangun sekali per query, bukan per CV
+        start_time = time.time()
+        automaton = AhoCorasick.compile(keyword)
+        exact_time += (time.time() - start_time) * 1000
+    elif algorithm == "WuManber":
+        start_time = time.time()
+        automaton = WuManber.compile(keyword)
+        exact_time += (time.time() - start_time) * 1000
+
+    for position, data in enumerate(chunk):
         if data.text == "":
             continue
         start_time = time.time()
@@ -125,27 +202,172 @@ def run_search_algorithm(algorithm: str, keyword: list[str], limit: int = 10) ->
         for key in keyword:
             res.keywords[key] = 0
 
-        if (algorithm == "KMP"):
+        if data.detail_id in excluded:
+            pass  # semua keyword tetap 0, CV langsung masuk tahap fuzzy
+        elif (algorithm == "KMP"):
             res.keywords = KMP.search_multi_pattern(data.text, keyword)
         elif (algorithm == "BM"):
             res.keywords = BM.search_multi_pattern(data.text, keyword)
         elif (algorithm == "AhoCorasick"):
-             res.keywords = AhoCorasick.search_multi_pattern(data.text, keyword)
+             res.keywords = automaton.count_occurrences(data.text)
+        elif (algorithm == "WuManber"):
+             res.keywords = automaton.count_occurrences(data.text)
         exact_time += (time.time() - start_time) * 1000
+        missed = [key for key in keyword if res.keywords[key] == 0]
+        if missed:
+            start_time = time.time()
+            if fuzzy_counts is not None and data.detail_id in indexed and all(key in fuzzy_counts for key in missed):
+                res.keywords.update({key: fuzzy_counts[key].get(data.detail_id, 0) for key in missed})
+            else:
+                res.keywords.update(Levenshtein.search_multi_pattern(data.text, missed, threshold=threshold))
+            fuzzy_time += (time.time() - start_time) * 1000
+        if sum(res.keywords.values()) > 0:
+            top.push(res, offset + position)
+
+    return os.getpid(), len(chunk), top, exact_time, fuzzy_time
+
+def iter_search_algorithm(algorithm: str, keyword: list[str], limit: int = 10, workers: int = None, threshold: float = FUZZY_THRESHOLD, batch_size: int = SEARCH_BATCH_SIZE, cancelled = None):
+    """
+    Runs the specified search algorithm and yields the best results found so far.
+
+    The corpus is streamed from the database in batches of batch_size CVs and
+    a SearchProgress snapshot is yielded after every batch, so callers can show
+    the current top-`limit` candidates before the whole corpus is scanned.
+    Memory holds the batches being searched (at most SEARCH_MAX_PENDING_PER_WORKER
+    per worker) and the top `limit` results, not the whole corpus. Closing the
+    generator stops the stream and cancels the batches that have not started
+    yet. The stream checks `cancelled` per row, so a superseded search stops
+    without further snapshots.
+
+    Args:
+        algorithm (str): The name of the search algorithm to run.
+        keyword (list of string): Keywords that need to be searched.
+        limit (int, optional): The maximum number of results to keep. Defaults to 10.
+        workers (int, optional): Number of worker processes. Defaults to SEARCH_WORKERS.
+        threshold (float, optional): Minimum Levenshtein similarity for a fuzzy match. Defaults to FUZZY_THRESHOLD.
+        batch_size (int, optional): Number of CVs per batch. Defaults to SEARCH_BATCH_SIZE.
+        cancelled (callable, optional): Returns True once the search should stop. Defaults to None.
+
+    Yields:
+        SearchProgress: Current top results, CVs scanned so far and timings.
+    """
+    if workers is None:
+        workers = SEARCH_WORKERS
+    batch_size = max(1, batch_size)
+
+    exact_time = 0
+    fuzzy_time = 0
+
+    # CV terindeks di luar hits[key] pasti tidak memuat key, yang tidak memuat keyword apa pun
+    # dilewati pada exact matching
+    start_time = time.time()
+    index = get_token_index()
+    hits = {key: index.candidates([key]) for key in keyword}
+    candidates = None if any(found is None for found in hits.values()) else set().union(*hits.values())
+    exact_time += (time.time() - start_time) * 1000
+
+    # Fuzzy matching lewat kosakata korpus: jarak dihitung sekali per term unik, dan hanya
+    # untuk keyword yang tidak ditemukan persis di suatu CV
+    fuzzy_counts : dict[str, dict[int, int] | None] = {}
+
+    def batch_fuzzy_counts(indexed: set[int]) -> dict[str, dict[int, int]] | None:
+        nonlocal fuzzy_time
+        result = {}
         for key in keyword:
-            if res.keywords[key] == 0:
+            missed = indexed if hits[key] is None else indexed - hits[key]
+            if not missed:
+                continue
+            if key not in fuzzy_counts:
                 start_time = time.time()
-                res.keywords = Levenshtein.search_multi_pattern(data.text, keyword)
+                fuzzy_counts[key] = index.fuzzy_counts(key, threshold)
                 fuzzy_time += (time.time() - start_time) * 1000
-        if sum(res.keywords.values()) > 0:
-            results.append(res)
+            counts = fuzzy_counts[key]
+            if counts is None:
+                return None
+            result[key] = {i: counts[i] for i in missed if i in counts}
+        return result
+
+    def batch_args(offset: int, batch: List[SearchData]) -> tuple:
+        nonlocal exact_time
+        # hanya bagian index yang relevan untuk batch ini yang dikirim ke worker
+        start_time = time.time()
+        ids = {data.detail_id for data in batch}
+        excluded = {i for i in ids if index.excludes(i, candidates)}
+        indexed = index.indexed(ids)
+        exact_time += (time.time() - start_time) * 1000
+        return (algorithm, keyword, batch, excluded, batch_fuzzy_counts(indexed), indexed, threshold, limit, offset)
 
-    print("[DEBUG] exact time : ===aopiawhfoiawh ", exact_time)
-    print("[DEBUG] fuzzy time : ===aopiawhfoiawh ", fuzzy_time)
+    total = get_cv_count()
+    stream = iter_search_data(batch_size, cancelled)
+    futures = set()
+
+    def tasks():
+        offset = 0
+        if workers <= 1:
+            for batch in stream:
+                yield search_chunk(*batch_args(offset, batch))
+                offset += len(batch)
+            return
+        # batch berikutnya baru dibaca saat ada worker yang hampir bebas
+        pool = get_search_pool(workers)
+        for batch in stream:
+            futures.add(pool.submit(search_chunk, *batch_args(offset, batch)))
+            offset += len(batch)
+            if len(futures) >= workers * SEARCH_MAX_PENDING_PER_WORKER:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    futures.discard(future)
+                    yield future.result()
+        for future in as_completed(list(futures)):
+            futures.discard(future)
+            yield future.result()
+
+    top = TopResults(limit)
+    scanned = 0
+    worker_times : dict[int, list[float]] = {}
+    try:
+        for pid, chunk_scanned, chunk_top, chunk_exact_time, chunk_fuzzy_time in tasks():
+            top.merge(chunk_top)
+            scanned += chunk_scanned
+            exact_time += chunk_exact_time
+            fuzzy_time += chunk_fuzzy_time
+            times = worker_times.setdefault(pid, [0, 0])
+            times[0] += chunk_exact_time
+            times[1] += chunk_fuzzy_time
+            yield SearchProgress(top.results(), scanned, max(total, scanned), exact_time, fuzzy_time, worker_times)
+        if scanned == 0 and not (cancelled is not None and cancelled()):
+            yield SearchProgress([], 0, 0, exact_time, fuzzy_time, worker_times)
+    finally:
+        for future in futures:
+            future.cancel()
+        stream.close()
+
+def run_search_algorithm(algorithm: str, keyword: list[str], limit: int = 10, workers: int = None, worker_times: list[tuple[float, float]] = None, threshold: float = FUZZY_THRESHOLD) -> tuple[List[ResultData], int, int]:
+    """
+    Runs the specified search algorithm with the given query.
+
+    Args:
+        algorithm (str): The name of the search algorithm to run.
+        keyword (list of string): Keywords that need to be searched.
+        limit (int, optional): The maximum number of results to return. Defaults to 10.
+        workers (int, optional): Number of worker processes. Defaults to SEARCH_WORKERS.
+        worker_times (list, optional): If given, receives the (exact, fuzzy) time of every worker.
+        threshold (float, optional): Minimum Levenshtein similarity for a fuzzy match. Defaults to FUZZY_THRESHOLD.
+
+    Returns:
+        List[ResultData]: A list of data matching the search criteria.
+        int : Exact Match Time (summed over all workers)
+        int : Fuzzy Match Time (summed over all workers)
+    """
+    progress = None
+    for progress in iter_search_algorithm(algorithm, keyword, limit, workers, threshold):
+        pass
 
-    results.sort(key=lambda x: sum(x.keywords.values()), reverse=True)
+    if worker_times is not None:
+        for worker_exact_time, worker_fuzzy_time in progress.worker_times.values():
+            worker_times.append((round(worker_exact_time, 6), round(worker_fuzzy_time, 6)))
 
-    return results[:limit], round(exact_time, 6), round(fuzzy_time, 6)
+    return progress.results, round(progress.exact_time, 6), round(progress.fuzzy_time, 6)
 
 def add_file(path_to_file:str) -> bool:
     """
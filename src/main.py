@@ -18,13 +18,56 @@ from PyQt5.QtWidgets import (
     QListWidget
 )
 from PyQt5.QtGui import QPixmap, QImage
-from PyQt5.QtCore import Qt, QStringListModel, QTimer
+from PyQt5.QtCore import Qt, QStringListModel, QTimer, QObject, QThread, pyqtSignal
 from ui.home import Ui_MainWindow
 from ui.summary import Ui_SummaryWindow
 from ui.toast import Toast
 from ui.wrapper import Wrapper
 from interface import *
 
+class SearchWorker(QObject):
+    """
+    Runs iter_search_algorithm off the GUI thread and reports every snapshot.
+    """
+    progress = pyqtSignal(int, int)                  # scanned, total
+    results_ready = pyqtSignal(list, float, float)   # top results so far, exact time, fuzzy time
+    finished = pyqtSignal(list, float, float)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+    done = pyqtSignal()                              # emitted last, whatever the outcome
+
+    def __init__(self, algorithm, keywords, limit):
+        super().__init__()
+        self.algorithm = algorithm
+        self.keywords = keywords
+        self.limit = limit
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        search = iter_search_algorithm(self.algorithm, self.keywords, self.limit, cancelled=lambda: self._cancelled)
+        progress = None
+        try:
+            for progress in search:
+                if self._cancelled:
+                    break
+                self.progress.emit(progress.scanned, progress.total)
+                self.results_ready.emit(progress.results, progress.exact_time, progress.fuzzy_time)
+        except Exception as e:
+            self.failed.emit(str(e))
+            self.done.emit()
+            return
+        finally:
+            search.close()
+
+        if self._cancelled:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(progress.results, round(progress.exact_time, 6), round(progress.fuzzy_time, 6))
+        self.done.emit()
+
 class CVWindow(QDialog):
     def __init__(self, file_path, parent=None):
         super().__init__(parent)
@@ -194,6 +237,7 @@ class MainWindow(QMainWindow):
         self.ui.btnBrowse.clicked.connect(self.handle_browse_button)
         self.ui.btnUpload.clicked.connect(self.handle_upload_button)
         self.ui.btnSearch.clicked.connect(self.handle_search_button)
+        self.ui.btnCancel.clicked.connect(self.handle_cancel_button)
         self.ui.btnClear.clicked.connect(self.handle_clear_button)
         self.ui.btnViewSummary.clicked.connect(self.handle_view_summary)
         self.ui.btnViewCV.clicked.connect(self.handle_view_cv)
@@ -203,10 +247,13 @@ class MainWindow(QMainWindow):
         self.ui.btnViewCV.setEnabled(False)
 
         self.uploaded_cvs = []
+        self.search_thread = None
+        self.search_worker = None
+        self.cancelled_worker = None  # pencarian yang dibatalkan lewat tombol Cancel, menunggu berhenti
+        self.running_searches = {}  # QThread -> SearchWorker, termasuk yang sudah digantikan
+        init_database()  # Buat database, pool koneksi, dan tabel sekali di awal
         clear_database()
-        conn = get_connection()  # Initialize database connection
         seed_database()
-        conn.close()
 
         # Load initial DB info
         self.load_database_info()
@@ -374,6 +421,8 @@ class MainWindow(QMainWindow):
             return "BM"
         elif self.ui.radioAhoCorasick.isChecked():
             return "AhoCorasick"
+        elif self.ui.radioWuManber.isChecked():
+            return "WuManber"
         return None
 
     def get_result_limit(self):
@@ -406,13 +455,113 @@ class MainWindow(QMainWindow):
             return
         toast = Toast("Searching...", duration=3000, parent=self)
         toast.show_above(self)
-        results, exact_time, fuzzy_time = run_search_algorithm(algorithm, keywords, limit)
+        self.start_search(algorithm, keywords, limit)
+
+    def start_search(self, algorithm, keywords, limit):
+        # query baru menggantikan pencarian yang masih berjalan
+        self.cancel_search()
 
         self.ui.listResults.clear()
+        self.ui.progressBar.setValue(0)
+        self.ui.btnCancel.setEnabled(True)
+        self.ui.btnViewSummary.setEnabled(False)
+        self.ui.btnViewCV.setEnabled(False)
+
+        thread = QThread(self)
+        worker = SearchWorker(algorithm, keywords, limit)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.handle_search_progress)
+        worker.results_ready.connect(self.handle_search_results)
+        worker.finished.connect(self.handle_search_finished)
+        worker.cancelled.connect(self.handle_search_cancelled)
+        worker.failed.connect(self.handle_search_failed)
+        worker.done.connect(thread.quit)
+        thread.finished.connect(lambda: self.running_searches.pop(thread, None))
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self.running_searches[thread] = worker
+
+        self.search_thread = thread
+        self.search_worker = worker
+        thread.start()
+
+    def cancel_search(self):
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+        self.search_worker = None
+        self.search_thread = None
+        self.ui.btnCancel.setEnabled(False)
+
+    def closeEvent(self, event):
+        for thread, worker in list(self.running_searches.items()):
+            worker.cancel()
+            thread.quit()
+            thread.wait()
+        super().closeEvent(event)
+
+    def is_current_search(self):
+        # sinyal dari pencarian yang sudah dibatalkan/digantikan diabaikan
+        return self.sender() is not None and self.sender() is self.search_worker
+
+    def handle_cancel_button(self):
+        if self.search_worker is None:
+            return
+        # UI direset di handle_search_cancelled, saat worker benar-benar berhenti
+        self.cancelled_worker = self.search_worker
+        self.cancel_search()
+        self.ui.progressBar.setValue(0)
+
+    def handle_search_progress(self, scanned, total):
+        if not self.is_current_search():
+            return
+        self.ui.progressBar.setValue(int(scanned * 100 / total) if total else 100)
+
+    def handle_search_results(self, results, exact_time, fuzzy_time):
+        if not self.is_current_search():
+            return
+        self.show_results(results, exact_time, fuzzy_time)
+
+    def handle_search_finished(self, results, exact_time, fuzzy_time):
+        if not self.is_current_search():
+            return
+        self.search_worker = None
+        self.search_thread = None
+        self.ui.btnCancel.setEnabled(False)
+        self.ui.progressBar.setValue(100)
+
+        self.show_results(results, exact_time, fuzzy_time)
         if len(results) == 0:
             toast = Toast("No results found", duration=3000, parent=self)
             toast.show_above(self)
             self.ui.listResults.addItem("No results found")
+        toast = Toast("Searching Done!!", duration=3000, parent=self)
+        toast.show_above(self)
+
+    def handle_search_cancelled(self):
+        # pencarian yang digantikan query baru atau dibersihkan tidak perlu diberitahukan
+        if self.sender() is None or self.sender() is not self.cancelled_worker:
+            return
+        self.cancelled_worker = None
+        if self.search_worker is None:
+            self.ui.progressBar.setValue(0)
+            self.ui.btnCancel.setEnabled(False)
+            has_results = any(self.ui.listResults.item(i).data(Qt.UserRole) is not None for i in range(self.ui.listResults.count()))
+            self.ui.btnViewSummary.setEnabled(has_results)
+            self.ui.btnViewCV.setEnabled(has_results)
+        toast = Toast("Search cancelled", duration=3000, parent=self)
+        toast.show_above(self)
+
+    def handle_search_failed(self, message):
+        if not self.is_current_search():
+            return
+        self.cancel_search()
+        toast = Toast("Search failed:\n" + message, duration=3000, parent=self)
+        toast.show_above(self)
+
+    def show_results(self, results, exact_time, fuzzy_time):
+        selected = self.get_selected_result()
+        self.ui.listResults.clear()
 
         for res in results:
             display_text = f"{res.name} (ID: {res.id})"
@@ -423,14 +572,16 @@ class MainWindow(QMainWindow):
             item = QListWidgetItem(display_text)
             item.setData(Qt.UserRole, res)
             self.ui.listResults.addItem(item)
+            if selected is not None and res.id == selected.id:
+                item.setSelected(True)
 
         if exact_time != None:
-            self.ui.lblExactMatchTime.setText("🎯 Exact Match : " + str(exact_time) + " ms")
+            self.ui.lblExactMatchTime.setText("🎯 Exact Match : " + str(round(exact_time, 6)) + " ms")
         else:
             self.ui.lblExactMatchTime.setText("🎯 Exact Match : -ms")
 
         if fuzzy_time != None:
-            self.ui.lblFuzzyMatchTime.setText("🔍 Fuzzy Match : " + str(fuzzy_time) + " ms")
+            self.ui.lblFuzzyMatchTime.setText("🔍 Fuzzy Match : " + str(round(fuzzy_time, 6)) + " ms")
         else:
             self.ui.lblFuzzyMatchTime.setText("🔍 Fuzzy Match : -ms")
         
@@ -441,10 +592,10 @@ class MainWindow(QMainWindow):
         
         self.ui.btnViewSummary.setEnabled(len(results) > 0)
         self.ui.btnViewCV.setEnabled(len(results) > 0)
-        toast = Toast("Searching Done!!", duration=3000, parent=self)
-        toast.show_above(self)
 
     def handle_clear_button(self):
+        self.cancel_search()
+        self.ui.progressBar.setValue(0)
         self.ui.inputKeywords.clear()
         self.ui.listResults.clear()
         self.ui.lblExactMatchTime.setText("🎯 Exact Match : -ms")
@@ -123,6 +123,15 @@ class Ui_MainWindow(object):
 "    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #7c3aed, stop:1 #6d28d9);\n"
 "}\n"
 "\n"
+"/* Cancel Button */\n"
+"QPushButton#btnCancel {\n"
+"    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f59e0b, stop:1 #d97706);\n"
+"}\n"
+"\n"
+"QPushButton#btnCancel:hover {\n"
+"    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #d97706, stop:1 #b45309);\n"
+"}\n"
+"\n"
 "/* Clear Button */\n"
 "QPushButton#btnClear {\n"
 "    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #ef4444, stop:1 #dc2626);\n"
@@ -308,6 +317,10 @@ class Ui_MainWindow(object):
         self.btnSearch = QtWidgets.QPushButton(self.groupSearch)
         self.btnSearch.setGeometry(QtCore.QRect(540, 35, 120, 35))
         self.btnSearch.setObjectName("btnSearch")
+        self.btnCancel = QtWidgets.QPushButton(self.groupSearch)
+        self.btnCancel.setEnabled(False)
+        self.btnCancel.setGeometry(QtCore.QRect(540, 80, 120, 35))
+        self.btnCancel.setObjectName("btnCancel")
         self.lblAlgorithm = QtWidgets.QLabel(self.groupSearch)
         self.lblAlgorithm.setGeometry(QtCore.QRect(20, 85, 100, 25))
         self.lblAlgorithm.setObjectName("lblAlgorithm")
@@ -321,6 +334,9 @@ class Ui_MainWindow(object):
         self.radioAhoCorasick.setGeometry(QtCore.QRect(385, 85, 130, 25))
         self.radioAhoCorasick.setChecked(True)
         self.radioAhoCorasick.setObjectName("radioAhoCorasick")
+        self.radioWuManber = QtWidgets.QRadioButton(self.groupSearch)
+        self.radioWuManber.setGeometry(QtCore.QRect(385, 125, 130, 25))
+        self.radioWuManber.setObjectName("radioWuManber")
         self.lblResultLimit = QtWidgets.QLabel(self.groupSearch)
         self.lblResultLimit.setGeometry(QtCore.QRect(20, 125, 100, 25))
         self.lblResultLimit.setObjectName("lblResultLimit")
@@ -460,10 +476,12 @@ class Ui_MainWindow(object):
         self.lblKeywords.setText(_translate("MainWindow", "🏷️ Keywords:"))
         self.inputKeywords.setPlaceholderText(_translate("MainWindow", "Enter search keywords (separated by comma)"))
         self.btnSearch.setText(_translate("MainWindow", "🔍 Search"))
+        self.btnCancel.setText(_translate("MainWindow", "⏹️ Cancel"))
         self.lblAlgorithm.setText(_translate("MainWindow", "⚙️ Algorithm:"))
         self.radioKMP.setText(_translate("MainWindow", "KMP"))
         self.radioBoyerMoore.setText(_translate("MainWindow", "Boyer-Moore"))
         self.radioAhoCorasick.setText(_translate("MainWindow", "Aho-Corasick"))
+        self.radioWuManber.setText(_translate("MainWindow", "Wu-Manber"))
         self.lblResultLimit.setText(_translate("MainWindow", "📊 Results:"))
         self.btnClear.setText(_translate("MainWindow", "🗑️ Clear"))
         self.groupDatabaseInfo.setTitle(_translate("MainWindow", "💾 Database Information"))